@@ -1,10 +1,52 @@
 from flask import Flask
 from flask_cors import CORS
+import os
+import time
+from config import database
+from config.database import init_db
 from routes.auth import auth_bp
 from routes.courses import courses_bp
+from utils import aio
+from utils.log import configure_logging
+from utils.metrics import init_metrics, APP_COLD_START
+from utils.json_provider import MongoJSONProvider
+from services.token_service import init_session_secret
+
+class AsyncIOFlask(Flask):
+    """Flask app that runs async views on the shared event loop in utils.aio."""
+
+    def async_to_sync(self, func):
+        return aio.async_to_sync(func)
+
+def warm_up() -> None:
+    """Build this process's clients before it takes traffic.
+
+    Opens Mongo connections and imports boto3 to build the S3 client, work
+    that would otherwise land on the first requests. Clients are per process,
+    so call this in each worker after it is forked.
+    """
+    from routes.courses import s3_service
+
+    database.warm_up()
+    s3_service.warm_up()
 
 def create_app():
-    app = Flask(__name__)
+    started = time.perf_counter()
+    configure_logging()
+
+    # ASYNC_IO_MODE=1 serves the course/enrollment read routes with async views
+    # on Motor; the default is the sync pymongo/boto3 path. Both modes hold one
+    # WSGI thread per request (see utils.aio)
+    async_io = os.getenv('ASYNC_IO_MODE', '0') == '1'
+    app = (AsyncIOFlask if async_io else Flask)(__name__)
+    app.json = MongoJSONProvider(app)
+
+    # SESSION_SECRET_KEY is required outside debug/testing (FLASK_DEBUG=1)
+    init_session_secret(app)
+
+    # Optional cap on request bodies (uploads), in bytes
+    if os.getenv('MAX_UPLOAD_BYTES'):
+        app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_BYTES'))
     CORS(app, resources={
         r"/*": {
             "origins": ["http://localhost:5173"],
@@ -13,16 +55,38 @@ def create_app():
         }
     })
 
+    # Per-route latency and Mongo/S3 call accounting, served on /metrics
+    init_metrics(app)
+
+    # Apply declared collections and indexes before taking traffic; deployments
+    # that run `manage.py indexes --apply` on release can skip this with
+    # DB_INIT_ON_STARTUP=0 to start faster
+    if os.getenv('DB_INIT_ON_STARTUP', '1') == '1':
+        init_db()
+
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(courses_bp, url_prefix='/api/courses')
 
+    if async_io:
+        from routes.async_courses import enable_async_views
+        enable_async_views(app)
+
     @app.route('/health')
     def health_check():
         return {"status": "healthy"}, 200
 
+    # Blueprints above import no heavy SDKs and open no connections; with
+    # APP_WARMUP=0 the caller runs warm_up() itself (e.g. after forking)
+    if os.getenv('APP_WARMUP', '1') == '1':
+        warm_up()
+    APP_COLD_START.observe(time.perf_counter() - started)
+
     return app
 
 if __name__ == '__main__':
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`.
+    # Debug is set before create_app so it may fall back to a random session key
+    os.environ.setdefault('FLASK_DEBUG', '1')
     app = create_app()
     app.run(debug=True, port=5002) 
\ No newline at end of file
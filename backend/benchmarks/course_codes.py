@@ -0,0 +1,103 @@
+"""Benchmark course code allocation under concurrent course creation.
+
+Creates courses from several threads at once against the database named by
+MONGODB_URI / MONGODB_DB, then checks that every allocated code is unique.
+Use a throwaway database: the benchmark drops its courses when it finishes.
+
+Usage:
+    MONGODB_DB=learnloop_bench python -m benchmarks.course_codes --courses 2000 --threads 16
+
+Pass --alphabet to shrink the code space (e.g. --alphabet AB) and force
+collisions, which exercises the insert-and-retry path.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from bson import ObjectId
+
+
+def run(courses: int, threads: int, alphabet: str = None) -> dict:
+    from config.database import course_collection, init_db
+    from services.course_service import CourseService
+
+    init_db()
+    teacher_id = str(ObjectId())
+    latencies = []
+    attempts = [0]
+    lock = threading.Lock()
+
+    original_generate = CourseService.generate_course_code
+
+    def counting_generate():
+        with lock:
+            attempts[0] += 1
+        if alphabet:
+            import random
+            return ''.join(random.choices(alphabet, k=6))
+        return original_generate()
+
+    def create(i):
+        start = time.perf_counter()
+        CourseService.create_course({
+            'courseName': f'Benchmark Course {i}',
+            'department': 'BENCH',
+            'courseNumber': str(i),
+            'term': 'Fall',
+            'year': '2024',
+            'teacherId': teacher_id,
+            'institution': 'Benchmark University'
+        })
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    failures = 0
+    with mock.patch.object(CourseService, 'generate_course_code', staticmethod(counting_generate)):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(create, i) for i in range(courses)]:
+                try:
+                    future.result()
+                except Exception:
+                    failures += 1
+        wall_time = time.perf_counter() - started
+
+    query = {"teacherId": ObjectId(teacher_id)}
+    codes = [doc['courseCode'] for doc in course_collection.find(query, {"courseCode": 1})]
+    course_collection.delete_many(query)
+
+    latencies.sort()
+    return {
+        'courses': courses,
+        'threads': threads,
+        'created': len(codes),
+        'failures': failures,
+        'uniqueCodes': len(set(codes)),
+        'codeAttempts': attempts[0],
+        'retries': attempts[0] - len(codes),
+        'throughputPerSec': round(len(codes) / wall_time, 1),
+        'p50Ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p99Ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2) if latencies else None
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--alphabet', help="Restrict code characters to force collisions")
+    args = parser.parse_args(argv)
+
+    from utils.log import configure_logging
+    configure_logging()
+    print(json.dumps(run(args.courses, args.threads, args.alphabet), indent=2))
+
+
+if __name__ == '__main__':
+    main()
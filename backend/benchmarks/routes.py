@@ -0,0 +1,323 @@
+"""Benchmark the main API routes against seeded synthetic data.
+
+Seeds institutions, teachers, students, courses, enrollments and PDFs at the
+requested scale, then drives each route through the Flask test client from
+several threads and reports throughput and p50/p99 latency as JSON.
+
+Runs against the database named by MONGODB_URI / MONGODB_DB and the bucket
+named by AWS_BUCKET_NAME (point AWS_ENDPOINT_URL at MinIO or LocalStack for a
+local S3). Use a throwaway database and bucket: the seeded data is deleted
+when the run finishes unless --keep is passed.
+
+With --in-memory, Mongo is replaced by mongomock and S3 by moto, so no
+services are needed (pip install -r benchmarks/requirements.txt).
+
+Usage:
+    MONGODB_DB=learnloop_bench python -m benchmarks.routes --scale 2 --requests 500
+    python -m benchmarks.routes --in-memory --output bench.json
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import statistics
+import string
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime
+
+from bson import ObjectId
+
+BENCH_PASSWORD = 'benchmark-password'
+
+# Per-institution counts at --scale 1
+SCALE = {
+    'teachers': 10,
+    'coursesPerTeacher': 3,
+    'students': 200,
+    'enrollmentsPerStudent': 4,
+    'filesPerCourse': 5
+}
+
+SCENARIOS = ['login', 'teacher_courses', 'student_courses', 'course_files', 'upload', 'enroll']
+
+
+def fake_pdf(size: int) -> bytes:
+    """A syntactically minimal PDF padded to roughly `size` bytes."""
+    header = b'%PDF-1.4\n'
+    trailer = b'\n%%EOF\n'
+    return header + b'0' * max(size - len(header) - len(trailer), 0) + trailer
+
+
+def in_memory_backends(stack: ExitStack) -> None:
+    """Swap Mongo and S3 for mongomock and moto before the app is imported."""
+    try:
+        import mongomock
+        from moto import mock_aws
+    except ImportError:
+        sys.exit("--in-memory needs mongomock and moto: pip install -r benchmarks/requirements.txt")
+
+    import pymongo
+    os.environ.setdefault('MONGODB_URI', 'mongodb://in-memory')
+    os.environ.setdefault('SESSION_SECRET_KEY', 'bench')
+    os.environ.setdefault('AWS_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_BUCKET_NAME', 'learnloop-bench')
+    os.environ['AWS_ACCESS_KEY_ID'] = 'bench'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'bench'
+    os.environ.pop('AWS_ENDPOINT_URL', None)
+    pymongo.MongoClient = mongomock.MongoClient
+    stack.enter_context(mock_aws())
+
+
+def seed(scale: int, institutions: int, pdf_size: int, s3_service) -> dict:
+    """Insert the synthetic dataset and return the IDs the scenarios need."""
+    from config.database import (
+        teacher_collection, student_collection, course_collection, enrollment_collection
+    )
+    from services.auth_service import AuthService
+    from services.material_service import MaterialService
+
+    rng = random.Random(42)
+    # One hash shared by every user; hashing per user would dominate seeding
+    password = AuthService.hash_password(BENCH_PASSWORD)
+    pdf = fake_pdf(pdf_size)
+    data = {'teachers': [], 'students': [], 'courses': [], 'codes': []}
+
+    for i in range(institutions):
+        institution = f'Benchmark University {i}'
+        teachers = [{
+            '_id': ObjectId(), 'username': f'bench_t{i}_{n}', 'email': f'bench_t{i}_{n}@example.edu',
+            'password': password, 'firstName': 'Teacher', 'lastName': str(n),
+            'institution': institution, 'role': 'teacher'
+        } for n in range(SCALE['teachers'] * scale)]
+        students = [{
+            '_id': ObjectId(), 'username': f'bench_s{i}_{n}', 'email': f'bench_s{i}_{n}@example.edu',
+            'password': password, 'firstName': 'Student', 'lastName': str(n),
+            'institution': institution, 'role': 'student'
+        } for n in range(SCALE['students'] * scale)]
+        courses = [{
+            '_id': ObjectId(), 'courseName': f'Course {n}', 'department': 'BENCH',
+            'courseNumber': str(n), 'term': 'Fall', 'year': '2024', 'teacherId': teacher['_id'],
+            'teacher': {'firstName': teacher['firstName'], 'lastName': teacher['lastName']},
+            'institution': institution,
+            'courseCode': ''.join(rng.choices(string.ascii_uppercase + string.digits, k=6))
+        } for teacher in teachers for n in range(SCALE['coursesPerTeacher'])]
+        enrollments = [{
+            'courseId': course['_id'], 'studentId': student['_id'],
+            'enrollDate': datetime.utcnow(), 'status': 'active'
+        } for student in students
+            for course in rng.sample(courses, min(SCALE['enrollmentsPerStudent'], len(courses)))]
+
+        teacher_collection.insert_many(teachers)
+        student_collection.insert_many(students)
+        course_collection.insert_many(courses)
+        enrollment_collection.insert_many(enrollments)
+
+        for course in courses:
+            for n in range(SCALE['filesPerCourse']):
+                key = s3_service.new_file_key(str(course['_id']))
+                s3_service.s3_client.put_object(Bucket=s3_service.bucket_name, Key=key, Body=pdf)
+                MaterialService.add_material(str(course['_id']), key, f'Week {n}', size=len(pdf))
+
+        data['teachers'] += teachers
+        data['students'] += students
+        data['courses'] += courses
+        data['codes'] += [course['courseCode'] for course in courses]
+
+    return data
+
+
+def cleanup(data: dict, s3_service) -> None:
+    """Delete everything seeded or created by the run."""
+    from config.database import (
+        teacher_collection, student_collection, course_collection, enrollment_collection,
+        material_collection
+    )
+
+    course_ids = [course['_id'] for course in data['courses']]
+    student_ids = [student['_id'] for student in data['students'] + data['walkIns']]
+    for course_id in course_ids:
+        for obj in s3_service.iter_objects(prefix=f'courses/{course_id}/'):
+            s3_service.s3_client.delete_object(Bucket=s3_service.bucket_name, Key=obj['Key'])
+    material_collection.delete_many({'courseId': {'$in': course_ids}})
+    enrollment_collection.delete_many({'studentId': {'$in': student_ids}})
+    course_collection.delete_many({'_id': {'$in': course_ids}})
+    student_collection.delete_many({'_id': {'$in': student_ids}})
+    teacher_collection.delete_many({'_id': {'$in': [t['_id'] for t in data['teachers']]}})
+
+
+def build_scenarios(data: dict, pdf: bytes, tokens: dict) -> dict:
+    """Map scenario name -> function(client, i) issuing one request."""
+    teachers, students, courses = data['teachers'], data['students'], data['courses']
+    walk_ins = data['walkIns']
+
+    def teacher_auth(teacher):
+        return {'Authorization': f"Bearer {tokens[teacher['_id']]}"}
+
+    def course_teacher(course):
+        return next(t for t in teachers if t['_id'] == course['teacherId'])
+
+    course_auth = {course['_id']: teacher_auth(course_teacher(course)) for course in courses}
+
+    def login(client, i):
+        user = students[i % len(students)] if i % 2 else teachers[i % len(teachers)]
+        return client.post('/api/auth/login', json={
+            'username': user['username'], 'password': BENCH_PASSWORD, 'role': user['role']
+        })
+
+    def teacher_courses(client, i):
+        return client.get(f"/api/courses/teacher/{teachers[i % len(teachers)]['_id']}")
+
+    def student_courses(client, i):
+        return client.get(f"/api/courses/student/{students[i % len(students)]['_id']}")
+
+    def course_files(client, i):
+        course = courses[i % len(courses)]
+        return client.get(f"/api/courses/{course['_id']}/files", headers=course_auth[course['_id']])
+
+    def upload(client, i):
+        course = courses[i % len(courses)]
+        return client.post(
+            f"/api/courses/{course['_id']}/upload",
+            headers=course_auth[course['_id']],
+            data={'file': (io.BytesIO(pdf), 'notes.pdf'), 'title': f'Upload {i}'},
+            content_type='multipart/form-data'
+        )
+
+    def enroll(client, i):
+        # Every request enrolls a new (student, course) pair
+        student = walk_ins[i // len(courses)]
+        return client.post('/api/courses/enroll', json={
+            'courseCode': data['codes'][i % len(courses)], 'studentId': str(student['_id'])
+        })
+
+    return {
+        'login': login,
+        'teacher_courses': teacher_courses,
+        'student_courses': student_courses,
+        'course_files': course_files,
+        'upload': upload,
+        'enroll': enroll
+    }
+
+
+def measure(app, request_fn, requests: int, threads: int) -> dict:
+    """Issue `requests` calls from `threads` threads and summarize latency."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    local = threading.local()
+
+    def call(i):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        start = time.perf_counter()
+        response = request_fn(local.client, i)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors.append(f"{response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(requests)))
+    wall_time = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'errors': len(errors),
+        'firstError': errors[0] if errors else None,
+        'throughputPerSec': round(requests / wall_time, 1),
+        'p50Ms': round(statistics.median(latencies) * 1000, 2),
+        'p99Ms': round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000, 2)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def run(args: argparse.Namespace) -> dict:
+    with ExitStack() as stack:
+        if args.in_memory:
+            in_memory_backends(stack)
+
+        from app import create_app
+        from config.database import student_collection
+        from routes.courses import s3_service
+        from services.token_service import TokenService
+
+        app = create_app()
+        if args.in_memory:
+            s3_service.s3_client.create_bucket(Bucket=s3_service.bucket_name)
+
+        seed_started = time.perf_counter()
+        data = seed(args.scale, args.institutions, args.pdf_kb * 1024, s3_service)
+        # Students with no enrollments, enough for one new pair per enroll request
+        data['walkIns'] = [{
+            '_id': ObjectId(), 'username': f'bench_walkin_{n}', 'email': f'bench_walkin_{n}@example.edu',
+            'firstName': 'Walk', 'lastName': str(n), 'role': 'student'
+        } for n in range(args.requests // len(data['courses']) + 1)]
+        student_collection.insert_many(data['walkIns'])
+        seed_seconds = time.perf_counter() - seed_started
+
+        tokens = {t['_id']: TokenService.issue(str(t['_id']), 'teacher')['token'] for t in data['teachers']}
+        scenarios = build_scenarios(data, fake_pdf(args.pdf_kb * 1024), tokens)
+
+        results = {}
+        try:
+            for name in args.scenarios:
+                results[name] = measure(app, scenarios[name], args.requests, args.threads)
+        finally:
+            if not args.keep:
+                cleanup(data, s3_service)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'backend': 'in-memory' if args.in_memory else 'live',
+        'params': {
+            'scale': args.scale, 'institutions': args.institutions, 'requests': args.requests,
+            'threads': args.threads, 'pdfKb': args.pdf_kb
+        },
+        'dataset': {
+            'teachers': len(data['teachers']), 'students': len(data['students']),
+            'courses': len(data['courses']), 'seedSeconds': round(seed_seconds, 2)
+        },
+        'scenarios': results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help="Multiplier for per-institution counts")
+    parser.add_argument('--institutions', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=200, help="Requests per scenario")
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--pdf-kb', type=int, default=256, help="Size of seeded and uploaded PDFs")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--in-memory', action='store_true', help="Use mongomock and moto instead of live services")
+    parser.add_argument('--keep', action='store_true', help="Leave the seeded data in place")
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    result = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(result + '\n')
+    print(result)
+
+
+if __name__ == '__main__':
+    main()
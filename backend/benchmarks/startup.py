@@ -0,0 +1,117 @@
+"""Measure app cold start: import time and create_app() in a fresh interpreter.
+
+Each run starts a new Python process that imports the app and calls
+create_app() with index setup and warm-up disabled, so it needs no Mongo or
+S3. It reports the import and factory time, the modules with the largest
+self import time (from `python -X importtime`), and any heavy SDK that was
+imported even though it should only be loaded on first use or in warm_up().
+
+With --budget-ms the command exits 1 when the median import + create_app
+time exceeds the budget or a heavy SDK was imported, so it can guard the
+cold-start budget in CI.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --budget-ms 1500 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.routes import git_commit
+
+# Modules that must not be imported by create_app(); they are loaded on first
+# use or by app.warm_up()
+HEAVY_MODULES = ['boto3', 'botocore.client', 'motor', 'redis']
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    'importSeconds': imported - started,
+    'createAppSeconds': created - imported,
+    'heavyModules': [name for name in %r if name in sys.modules]
+}))
+"""
+
+
+def probe(env: dict = None) -> dict:
+    """Start the app in a fresh interpreter and return its timings and import profile."""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {
+        **os.environ,
+        'MONGODB_URI': os.getenv('MONGODB_URI', 'mongodb://localhost:27017'),
+        'SESSION_SECRET_KEY': os.getenv('SESSION_SECRET_KEY', 'startup-probe'),
+        'DB_INIT_ON_STARTUP': '0',
+        'APP_WARMUP': '0',
+        **(env or {})
+    }
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE % HEAVY_MODULES],
+        cwd=backend_dir, env=env, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['imports'] = parse_importtime(result.stderr)
+    return report
+
+
+def parse_importtime(output: str) -> dict:
+    """Self import time in microseconds per module, from `-X importtime` output."""
+    imports = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        imports[name.strip()] = int(self_us)
+    return imports
+
+
+def run(runs: int, top: int) -> dict:
+    probes = [probe() for _ in range(runs)]
+    totals = [p['importSeconds'] + p['createAppSeconds'] for p in probes]
+    slowest = sorted(probes[-1]['imports'].items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'runs': runs,
+        'importMs': round(statistics.median(p['importSeconds'] for p in probes) * 1000, 1),
+        'createAppMs': round(statistics.median(p['createAppSeconds'] for p in probes) * 1000, 1),
+        'totalMs': round(statistics.median(totals) * 1000, 1),
+        'modulesImported': len(probes[-1]['imports']),
+        'slowestImports': [{'module': name, 'selfMs': round(us / 1000, 1)} for name, us in slowest],
+        'heavyModules': sorted({name for p in probes for name in p['heavyModules']})
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument('--top', type=int, default=15, help="Slowest imports to list")
+    parser.add_argument('--budget-ms', type=float, help="Fail if the median cold start exceeds this")
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.runs, args.top)
+    result = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(result + '\n')
+    print(result)
+
+    if args.budget_ms is not None:
+        over_budget = report['totalMs'] > args.budget_ms
+        return 1 if over_budget or report['heavyModules'] else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Async database configuration module.
+
+Provides a Motor client for async I/O mode. The client is bound to the
+background event loop from utils.aio and is created on first use in each
+process, so it is never shared across a fork.
+
+Collection names, the database and the pool options are the same as
+config.database.
+"""
+
+import asyncio
+from config.database import DB_NAME, client_options, mongodb_uri
+
+_client = None
+_client_loop = None
+
+def get_async_db():
+    """Return the Motor database for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _client = AsyncIOMotorClient(mongodb_uri(), io_loop=loop, **client_options())
+        _client_loop = loop
+    return _client[DB_NAME]
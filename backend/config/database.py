@@ -2,46 +2,193 @@
 
 This module handles MongoDB connection setup and provides access to collections.
 
+The MongoClient is created lazily, once per process: importing this module
+(or any service) does not connect, and a worker forked from a preloaded
+parent builds its own client and pool on first use instead of inheriting the
+parent's sockets. The collections below are proxies that resolve against the
+current process's client.
+
 Environment Variables:
     MONGODB_URI (str): MongoDB connection string
+    MONGODB_DB (str): Database name, defaults to learnloopcluster1db
+    MONGO_MAX_POOL_SIZE (int): Connections per worker process, defaults to 100
+    MONGO_MIN_POOL_SIZE (int): Connections kept open while idle, defaults to 0
+    MONGO_MAX_IDLE_TIME_MS (int): Close connections idle this long, unset to keep them
+    MONGO_SERVER_SELECTION_TIMEOUT_MS (int): Give up finding a server after this
+        long, defaults to 30000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS (int): Fail an operation that waited this long
+        for a pooled connection, unset to wait indefinitely
+    MONGO_WARMUP_CONNECTIONS (int): Connections opened by warm_up, defaults to
+        MONGO_MIN_POOL_SIZE (at least 1)
 
 Collections:
     - teacherDirectory: Collection for teacher documents
     - studentDirectory: Collection for student documents
     - courseCatalog: Collection for course documents
+    - enrollments: Collection for student enrollments
+    - materials: Catalog of course files stored in S3
+    - versionStamps: Listing version counters for ETags (services/version_stamps.py)
 
 Raises:
-    ValueError: If MONGODB_URI environment variable is not set
+    ValueError: On first use, if MONGODB_URI environment variable is not set
 """
 
+from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
 from pymongo import MongoClient
+from pymongo.database import Database
 from dotenv import load_dotenv
+from config.indexes import INDEXES, ensure_indexes
+from utils.log import get_logger
+from utils.metrics import MongoCommandMetrics, MongoPoolMetrics, MONGO_WARMUP
 import os
+import threading
+import time
 
 # Load environment variables
 load_dotenv()
 
-# MongoDB connection
-uri = os.getenv('MONGODB_URI')
-if not uri:
-    raise ValueError("No MongoDB URI found in environment variables")
+logger = get_logger(__name__)
+
+DB_NAME = os.getenv('MONGODB_DB', 'learnloopcluster1db')
+
+# Environment variable -> MongoClient option; unset variables keep the driver default
+POOL_OPTIONS = {
+    'MONGO_MAX_POOL_SIZE': 'maxPoolSize',
+    'MONGO_MIN_POOL_SIZE': 'minPoolSize',
+    'MONGO_MAX_IDLE_TIME_MS': 'maxIdleTimeMS',
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS': 'serverSelectionTimeoutMS',
+    'MONGO_WAIT_QUEUE_TIMEOUT_MS': 'waitQueueTimeoutMS',
+}
+
+def mongodb_uri() -> str:
+    """Return MONGODB_URI.
+
+    Raises:
+        ValueError: If MONGODB_URI is not set
+    """
+    uri = os.getenv('MONGODB_URI')
+    if not uri:
+        raise ValueError("No MongoDB URI found in environment variables")
+    return uri
+
+def client_options() -> Dict[str, Any]:
+    """MongoClient keyword arguments: metrics listeners plus the pool tunables."""
+    options = {'event_listeners': [MongoCommandMetrics(), MongoPoolMetrics()]}
+    for variable, option in POOL_OPTIONS.items():
+        value = os.getenv(variable)
+        if value:
+            options[option] = int(value)
+    return options
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+def get_client() -> MongoClient:
+    """Return this process's MongoClient, creating it on first use (and again after a fork)."""
+    global _client, _client_pid
+    if _client_pid != os.getpid():
+        with _client_lock:
+            if _client_pid != os.getpid():
+                # A client inherited across fork is dropped, not closed: its
+                # sockets are shared with the parent, which still owns them
+                _client = MongoClient(mongodb_uri(), **client_options())
+                _client_pid = os.getpid()
+    return _client
+
+def close_client() -> None:
+    """Close this process's client, if it has one; the next use builds a new one.
+
+    A pre-forking server calls this in the parent once it has finished its
+    own database work, so no idle client is left running beside the workers.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+def get_db() -> Database:
+    """Return the application database on this process's client."""
+    return get_client()[DB_NAME]
+
+class LazyDatabase:
+    """Stand-in for the pymongo Database that resolves on each use."""
+
+    name = DB_NAME
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(get_db(), attr)
 
-client = MongoClient(uri)
-db = client.learnloopcluster1db
+    def __getitem__(self, collection_name: str) -> Any:
+        return get_db()[collection_name]
+
+class LazyCollection:
+    """Stand-in for a pymongo Collection that resolves on each use.
+
+    Services import collections at module level; the proxy keeps that working
+    without a client existing at import time.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(get_db()[self.name], attr)
+
+    def __repr__(self) -> str:
+        return f"LazyCollection({self.name!r})"
+
+db = LazyDatabase()
 
 # Collections
-teacher_collection = db.teacherDirectory
-student_collection = db.studentDirectory
-course_collection = db.courseCatalog
-enrollment_collection = db.enrollments
+teacher_collection = LazyCollection('teacherDirectory')
+student_collection = LazyCollection('studentDirectory')
+course_collection = LazyCollection('courseCatalog')
+enrollment_collection = LazyCollection('enrollments')
+material_collection = LazyCollection('materials')
+version_collection = LazyCollection('versionStamps')
+
+def warm_up(connections: Optional[int] = None) -> float:
+    """Connect this process's client and open connections before taking traffic.
+
+    Issues `connections` pings concurrently, so server selection and the
+    connection handshakes happen here rather than in the first requests.
+
+    Args:
+        connections (Optional[int]): Pings to run at once, defaults to
+            MONGO_WARMUP_CONNECTIONS
+
+    Returns:
+        float: Seconds the warm-up took
+    """
+    if connections is None:
+        connections = int(os.getenv('MONGO_WARMUP_CONNECTIONS') or os.getenv('MONGO_MIN_POOL_SIZE') or 1)
+    connections = max(connections, 1)
+
+    started = time.perf_counter()
+    client = get_client()
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix='mongo-warmup') as pool:
+        list(pool.map(lambda _: client.admin.command('ping'), range(connections)))
+    seconds = time.perf_counter() - started
+    MONGO_WARMUP.observe(seconds)
+    logger.info("Mongo warm-up opened %d connections in %.3fs", connections, seconds)
+    return seconds
 
 def init_db():
-    """Initialize database collections if they don't exist."""
-    if 'teacherDirectory' not in db.list_collection_names():
-        db.create_collection('teacherDirectory')
-    if 'studentDirectory' not in db.list_collection_names():
-        db.create_collection('studentDirectory')
-    if 'courseCatalog' not in db.list_collection_names():
-        db.create_collection('courseCatalog')
-    if 'enrollments' not in db.list_collection_names():
-        db.create_collection('enrollments') 
\ No newline at end of file
+    """Initialize database collections and indexes if they don't exist.
+
+    Returns:
+        Dict[str, List[str]]: Index build errors keyed by "collection.index"
+    """
+    existing = set(db.list_collection_names())
+    for name in INDEXES:
+        if name not in existing:
+            db.create_collection(name)
+
+    errors = ensure_indexes(db)
+    for index, messages in errors.items():
+        logger.error("Failed to apply index %s: %s", index, '; '.join(messages))
+    return errors
@@ -0,0 +1,153 @@
+"""Index registry module.
+
+Declares every index the application relies on and applies them idempotently.
+`init_db` calls `ensure_indexes` on startup; `index_report` powers the
+`python manage.py indexes` command.
+
+Unique indexes replace check-then-insert lookups: a duplicate write fails with
+`DuplicateKeyError` instead of racing a prior `find_one`. Fields that older
+documents may lack are indexed with a partial filter so missing values do not
+collide.
+"""
+
+from typing import Dict, Any, List
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+
+# Case-insensitive matching for email lookups (strength 2 ignores case only)
+EMAIL_COLLATION = {'locale': 'en', 'strength': 2}
+
+
+def _unique_string(field: str, name: str) -> IndexModel:
+    """Build a unique index that only covers documents where `field` is a string."""
+    return IndexModel(
+        [(field, ASCENDING)],
+        name=name,
+        unique=True,
+        partialFilterExpression={field: {"$type": "string"}}
+    )
+
+
+# Collection name -> declared indexes
+INDEXES: Dict[str, List[IndexModel]] = {
+    'teacherDirectory': [
+        _unique_string('username', 'username_unique'),
+        _unique_string('email', 'email_unique'),
+    ],
+    'studentDirectory': [
+        _unique_string('username', 'username_unique'),
+        _unique_string('email', 'email_unique'),
+        # Roster imports match emails regardless of case; queries must pass
+        # collation=EMAIL_COLLATION to use it
+        IndexModel([('email', ASCENDING)], name='email_ci', collation=EMAIL_COLLATION),
+    ],
+    'courseCatalog': [
+        _unique_string('courseCode', 'courseCode_unique'),
+        # Teacher listings: equality on teacherId (and optionally year, term),
+        # sorted by (year, term, _id) descending for keyset pagination
+        IndexModel(
+            [('teacherId', ASCENDING), ('year', DESCENDING), ('term', DESCENDING), ('_id', DESCENDING)],
+            name='teacherId_year_term_id'
+        ),
+    ],
+    'enrollments': [
+        IndexModel([('studentId', ASCENDING), ('status', ASCENDING)], name='studentId_status'),
+        IndexModel([('courseId', ASCENDING), ('studentId', ASCENDING)], name='courseId_studentId_unique', unique=True),
+    ],
+    'materials': [
+        IndexModel([('key', ASCENDING)], name='key_unique', unique=True),
+        IndexModel([('courseId', ASCENDING), ('_id', ASCENDING)], name='courseId_id'),
+    ],
+    # Listing version counters, only ever read and written by _id
+    'versionStamps': [],
+}
+
+
+def _key_pattern(key, collation=None) -> tuple:
+    """Normalize an index key specification (and collation) to a comparable tuple.
+
+    The collation is part of the signature, so a collated index is not
+    mistaken for a plain index on the same fields.
+    """
+    pairs = key.items() if hasattr(key, 'items') else key
+    signature = tuple((field, direction) for field, direction in pairs)
+    if collation:
+        signature += (('collation', collation.get('locale'), collation.get('strength')),)
+    return signature
+
+
+def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create every declared index that does not exist yet.
+
+    `create_indexes` is a no-op for indexes that already exist with the same
+    specification, so this is safe to call on every startup.
+
+    Args:
+        db: The pymongo Database to apply the registry to
+
+    Returns:
+        Dict[str, List[str]]: Errors keyed by "collection.index", empty when all
+            indexes were applied. A unique index fails to build while duplicate
+            documents still exist; the error is reported instead of raised so
+            the application can still start.
+    """
+    errors = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        for model in models:
+            name = model.document['name']
+            try:
+                collection.create_indexes([model])
+            except OperationFailure as e:
+                errors.setdefault(f"{collection_name}.{name}", []).append(str(e))
+    return errors
+
+
+def index_report(db) -> Dict[str, Dict[str, Any]]:
+    """Compare declared indexes against the live database.
+
+    Args:
+        db: The pymongo Database to inspect
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per-collection report with:
+            - missing (List[str]): Declared indexes that do not exist
+            - undeclared (List[str]): Existing indexes not in the registry
+            - unused (List[str]): Existing indexes with no recorded accesses
+                since the server last restarted (from $indexStats)
+    """
+    report = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = collection.index_information()
+        existing_keys = {
+            _key_pattern(info['key'], info.get('collation')): name for name, info in existing.items()
+        }
+        declared_keys = {
+            _key_pattern(model.document['key'], model.document.get('collation')): model.document['name']
+            for model in models
+        }
+
+        missing = [name for key, name in declared_keys.items() if key not in existing_keys]
+        undeclared = [
+            name for key, name in existing_keys.items()
+            if key not in declared_keys and name != '_id_'
+        ]
+
+        try:
+            stats = collection.aggregate([{"$indexStats": {}}])
+            unused = [
+                stat['name'] for stat in stats
+                if stat['name'] != '_id_' and stat['accesses']['ops'] == 0
+            ]
+        except OperationFailure:
+            # $indexStats requires the clusterMonitor role on some deployments
+            unused = []
+
+        report[collection_name] = {
+            'missing': missing,
+            'undeclared': undeclared,
+            'unused': sorted(unused)
+        }
+    return report
@@ -1,20 +1,35 @@
 from functools import wraps
 from flask import request, g
-import json
+from typing import Dict, Any, Optional
+from services.token_service import TokenService
 from utils.helpers import create_response
 
+def authenticate_request() -> Optional[Dict[str, Any]]:
+    """Verify the request's "Authorization: Bearer <token>" header.
+
+    Returns:
+        Optional[Dict[str, Any]]: The user ('_id', 'userId', 'role') the token
+            was issued to, or None if the header is missing or the token is invalid
+    """
+    auth_header = request.headers.get('Authorization', '')
+    scheme, _, token = auth_header.partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+
+    claims = TokenService.verify(token.strip())
+    if not claims:
+        return None
+    return {'_id': claims['sub'], 'userId': claims['sub'], 'role': claims['role']}
+
 def auth_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
+        if not request.headers.get('Authorization'):
             return create_response(error="No authorization provided", status_code=401)
-            
-        try:
-            # Extract user data from token or session
-            user_data = json.loads(auth_header)
-            g.user = user_data
-            return f(*args, **kwargs)
-        except Exception as e:
+
+        user_data = authenticate_request()
+        if not user_data:
             return create_response(error="Invalid authorization", status_code=401)
-    return decorated_function 
\ No newline at end of file
+        g.user = user_data
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,102 @@
+"""Gunicorn settings for serving the API in production.
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is built once in the parent (preload_app), which also applies the
+declared indexes, and shared copy-on-write by the workers. The Mongo and S3
+clients are per process: each worker builds its own and warms it up in
+post_worker_init, before its first accept. Workers are recycled after
+GUNICORN_MAX_REQUESTS requests or once their resident memory passes
+GUNICORN_MAX_WORKER_RSS_MB, and on shutdown or recycle a worker gets
+GUNICORN_GRACEFUL_TIMEOUT seconds to finish in-flight requests such as
+uploads.
+
+Environment Variables:
+    PORT (int): Port to listen on, defaults to 5002
+    GUNICORN_BIND (str): Full bind address, overrides PORT
+    WEB_CONCURRENCY (int): Worker processes, defaults to 2 * CPUs + 1
+    GUNICORN_WORKER_CLASS (str): Worker type, defaults to gthread
+    GUNICORN_THREADS (int): Threads per gthread worker, defaults to 4
+    GUNICORN_TIMEOUT (int): Seconds a silent worker may run before it is killed,
+        defaults to 120
+    GUNICORN_GRACEFUL_TIMEOUT (int): Seconds a stopping worker gets to finish
+        its requests, defaults to 120
+    GUNICORN_KEEPALIVE (int): Seconds to hold idle keep-alive connections, defaults to 5
+    GUNICORN_MAX_REQUESTS (int): Requests before a worker is recycled, 0 to
+        disable, defaults to 5000
+    GUNICORN_MAX_WORKER_RSS_MB (int): Resident memory that gets a worker
+        recycled, 0 to disable, defaults to 512
+    GUNICORN_RSS_CHECK_INTERVAL (int): Requests between memory checks, defaults to 50
+"""
+
+import os
+import resource
+
+_cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5002')}")
+workers = int(os.getenv('WEB_CONCURRENCY', str(2 * _cpus + 1)))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '120'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Jitter so the workers don't all restart at the same moment
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+
+MAX_WORKER_RSS_MB = int(os.getenv('GUNICORN_MAX_WORKER_RSS_MB', '512'))
+RSS_CHECK_INTERVAL = int(os.getenv('GUNICORN_RSS_CHECK_INTERVAL', '50'))
+
+preload_app = True
+
+# Heartbeat files in memory, so a slow disk can't get workers killed
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# create_app runs in the parent under preload; warm-up happens per worker instead
+os.environ.setdefault('APP_WARMUP', '0')
+
+def rss_bytes() -> int:
+    """Current resident memory of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # No /proc (e.g. macOS): fall back to the peak, reported in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def when_ready(server):
+    # The parent's client was only needed for index setup; workers build their own
+    from config.database import close_client
+    close_client()
+
+def post_worker_init(worker):
+    # Runs in the worker after fork and before it accepts connections
+    from app import warm_up
+    try:
+        warm_up()
+    except Exception:
+        # Serve anyway; the clients are built again on first use
+        worker.log.exception("Worker warm-up failed")
+    worker.requests_handled = 0
+
+def post_request(worker, req, environ, resp):
+    if not MAX_WORKER_RSS_MB:
+        return
+    worker.requests_handled = getattr(worker, 'requests_handled', 0) + 1
+    if worker.requests_handled % RSS_CHECK_INTERVAL:
+        return
+    rss_mb = rss_bytes() / (1024 * 1024)
+    if rss_mb > MAX_WORKER_RSS_MB and worker.alive:
+        # Same path as max_requests: stop accepting, finish in-flight requests, exit
+        worker.log.info("Recycling worker %s at %.0f MB RSS", worker.pid, rss_mb)
+        worker.alive = False
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
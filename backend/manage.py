@@ -0,0 +1,92 @@
+"""Maintenance commands for the LearnLoop backend.
+
+Usage:
+    python manage.py indexes            Report missing, undeclared and unused indexes
+    python manage.py indexes --apply    Create missing indexes, then report
+    python manage.py reconcile-materials [--course-id ID] [--prune]
+                                        Backfill the materials catalog from S3
+    python manage.py abort-stale-uploads [--older-than-hours N]
+                                        Abort multipart uploads that never completed
+    python manage.py check-teacher-summaries [--repair]
+                                        Find (and rewrite) stale teacher names on courses
+"""
+
+import argparse
+import json
+import sys
+
+
+def indexes_command(args: argparse.Namespace) -> int:
+    """Apply and/or report on the declared index registry."""
+    from config.database import db, init_db
+    from config.indexes import index_report
+
+    if args.apply:
+        errors = init_db()
+        if errors:
+            print(json.dumps({"errors": errors}, indent=2))
+
+    report = index_report(db)
+    print(json.dumps(report, indent=2))
+    return 1 if any(entry['missing'] for entry in report.values()) else 0
+
+
+def reconcile_materials_command(args: argparse.Namespace) -> int:
+    """Backfill the materials catalog from the objects stored in S3."""
+    from services.material_service import MaterialService
+    from services.s3_service import S3Service
+
+    counts = MaterialService.reconcile(S3Service(), course_id=args.course_id, prune=args.prune)
+    print(json.dumps(counts, indent=2))
+    return 0
+
+
+def abort_stale_uploads_command(args: argparse.Namespace) -> int:
+    """Abort incomplete multipart uploads older than the given age."""
+    from datetime import timedelta
+    from services.s3_service import S3Service
+
+    aborted = S3Service().abort_incomplete_uploads(older_than=timedelta(hours=args.older_than_hours))
+    print(json.dumps({"aborted": aborted}, indent=2))
+    return 0
+
+
+def check_teacher_summaries_command(args: argparse.Namespace) -> int:
+    """Compare course teacher summaries with teacherDirectory."""
+    from services.course_service import CourseService
+
+    counts = CourseService.check_teacher_summaries(repair=args.repair)
+    print(json.dumps(counts, indent=2))
+    return 1 if counts['drifted'] and not args.repair else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LearnLoop maintenance commands")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    indexes_parser = subparsers.add_parser('indexes', help="Report on declared indexes")
+    indexes_parser.add_argument('--apply', action='store_true', help="Create missing indexes first")
+    indexes_parser.set_defaults(func=indexes_command)
+
+    reconcile_parser = subparsers.add_parser('reconcile-materials', help="Backfill the materials catalog from S3")
+    reconcile_parser.add_argument('--course-id', help="Only reconcile this course")
+    reconcile_parser.add_argument('--prune', action='store_true', help="Remove catalog entries whose object is gone")
+    reconcile_parser.set_defaults(func=reconcile_materials_command)
+
+    abort_parser = subparsers.add_parser('abort-stale-uploads', help="Abort multipart uploads that never completed")
+    abort_parser.add_argument('--older-than-hours', type=float, default=24, help="Minimum age of uploads to abort")
+    abort_parser.set_defaults(func=abort_stale_uploads_command)
+
+    summaries_parser = subparsers.add_parser('check-teacher-summaries', help="Check teacher names stored on courses")
+    summaries_parser.add_argument('--repair', action='store_true', help="Rewrite the summaries that drifted")
+    summaries_parser.set_defaults(func=check_teacher_summaries_command)
+
+    args = parser.parse_args(argv)
+
+    from utils.log import configure_logging
+    configure_logging()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
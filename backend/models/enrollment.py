@@ -1,9 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
-from config.database import db
-
-# Collection for enrollments
-enrollment_collection = db.enrollments
+from config.database import enrollment_collection
 
 # Helper function to create enrollment
 def create_enrollment(course_id, student_id):
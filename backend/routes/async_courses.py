@@ -0,0 +1,124 @@
+"""Async I/O mode views for the course and enrollment read routes.
+
+When ASYNC_IO_MODE is enabled, create_app swaps these in for the sync views
+of the same endpoints on courses_bp, so URLs, auth and response shapes are
+unchanged. They run on the shared event loop from utils.aio with Motor for
+Mongo. Each request still holds a WSGI thread while its view runs, so the mode
+does not raise how many requests a process can serve at once (see utils.aio).
+"""
+
+from flask import Flask, request
+from typing import Tuple, Dict, Any
+from routes.courses import (
+    teacher_required, s3_service, FILES_PAGE_SIZE, FILES_MAX_PAGE_SIZE,
+    TEACHER_COURSES_PAGE_SIZE, TEACHER_COURSES_MAX_PAGE_SIZE
+)
+from services.async_course_service import AsyncCourseService
+from services.s3_service import presign_window
+from services.version_stamps import (
+    VersionStamps, COURSES_KEY, teacher_courses_key, student_courses_key, course_files_key, stamp_window
+)
+from utils.helpers import create_response, parse_page_args, make_etag, not_modified, conditional_headers
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+async def get_teacher_courses(teacher_id: str) -> Tuple[Dict[str, Any], int]:
+    """Async version of routes.courses.get_teacher_courses."""
+    try:
+        if not teacher_id:
+            return create_response({"courses": [], "nextCursor": None})
+
+        limit, after = parse_page_args(request.args, TEACHER_COURSES_PAGE_SIZE, TEACHER_COURSES_MAX_PAGE_SIZE)
+        etag = make_etag(
+            request.full_path, await VersionStamps.get_async([teacher_courses_key(teacher_id)]), stamp_window()
+        )
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        courses, next_cursor = await AsyncCourseService.get_teacher_courses(
+            teacher_id, limit, after,
+            term=request.args.get('term'),
+            year=request.args.get('year')
+        )
+        return create_response({"courses": courses, "nextCursor": next_cursor}, headers=conditional_headers(etag))
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
+    except Exception as e:
+        logger.exception("Error in get_teacher_courses route")
+        return create_response({"courses": [], "nextCursor": None})
+
+@teacher_required
+async def get_course_details(course_id: str) -> Tuple[Dict[str, Any], int]:
+    """Async version of routes.courses.get_course_details."""
+    try:
+        try:
+            course = await AsyncCourseService.get_course_with_teacher(course_id)
+        except Exception as e:
+            logger.info("Error retrieving course %s: %s", course_id, e)
+            return create_response(error="Invalid course ID format", status_code=400)
+
+        if not course:
+            return create_response(error="Course not found", status_code=404)
+
+        return create_response({"course": course})
+    except Exception as e:
+        logger.exception("Error in get_course_details")
+        return create_response(error="Failed to fetch course details", status_code=500)
+
+@teacher_required
+async def get_course_files(course_id):
+    """Async version of routes.courses.get_course_files."""
+    try:
+        limit, after = parse_page_args(request.args, FILES_PAGE_SIZE, FILES_MAX_PAGE_SIZE)
+        etag = make_etag(
+            request.full_path, await VersionStamps.get_async([course_files_key(course_id)]),
+            presign_window(), stamp_window()
+        )
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        files, next_cursor = await AsyncCourseService.list_course_files(course_id, s3_service, limit, after)
+        return create_response({
+            'files': files,
+            'nextCursor': next_cursor
+        }, headers=conditional_headers(etag))
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
+    except Exception as e:
+        logger.exception("Error getting course files")
+        return create_response(error="Failed to get course files", status_code=500)
+
+async def get_student_courses(student_id):
+    """Async version of routes.courses.get_student_courses."""
+    try:
+        etag = make_etag(
+            request.full_path, await VersionStamps.get_async([student_courses_key(student_id), COURSES_KEY]),
+            stamp_window()
+        )
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        courses = await AsyncCourseService.get_student_courses(student_id)
+        return create_response({"courses": courses}, headers=conditional_headers(etag))
+    except ValueError:
+        return create_response(error="Invalid student ID format", status_code=400)
+    except Exception as e:
+        logger.exception("Error getting student courses")
+        return create_response(error=str(e), status_code=500)
+
+# courses_bp endpoint -> async view
+ASYNC_VIEWS = {
+    'courses.get_teacher_courses': get_teacher_courses,
+    'courses.get_course_details': get_course_details,
+    'courses.get_course_files': get_course_files,
+    'courses.get_student_courses': get_student_courses,
+}
+
+def enable_async_views(app: Flask) -> None:
+    """Replace the sync views of ASYNC_VIEWS on an app with their async versions."""
+    for endpoint, view in ASYNC_VIEWS.items():
+        app.view_functions[endpoint] = view
@@ -1,10 +1,23 @@
-from flask import Blueprint, request
-from services.auth_service import AuthService
+from flask import Blueprint, request, g
+from services.auth_service import AuthService, PasswordHashingBusy, BCRYPT_RETRY_AFTER
+from services.token_service import TokenService
+from decorators import auth_required
 from utils.helpers import create_response
+from utils.log import get_logger
 from typing import Tuple, Dict, Any
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+logger = get_logger(__name__)
+
+def _busy_response(error: PasswordHashingBusy) -> Tuple[Dict[str, Any], int]:
+    """Tell the client to retry once the bcrypt pool has drained."""
+    return create_response(
+        error=str(error),
+        status_code=503,
+        headers={'Retry-After': str(BCRYPT_RETRY_AFTER)}
+    )
+
 @auth_bp.route('/register', methods=['POST'])
 def register() -> Tuple[Dict[str, Any], int]:
     """Handle user registration.
@@ -30,21 +43,27 @@ def register() -> Tuple[Dict[str, Any], int]:
     """
     try:
         data = request.json
-        # Check existing user
-        if AuthService.get_user_by_username(data['username'], data['role']):
-            return create_response(error="Username already exists", status_code=400)
-        
+        # Duplicate usernames are rejected by the unique index on insert
         result = AuthService.create_user(data)
         return create_response({
             "message": f"Registration successful as {data['role']}",
             "userId": result['userId']
         }, status_code=201)
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
+    except PasswordHashingBusy as e:
+        return _busy_response(e)
     except Exception as e:
         return create_response(error=str(e), status_code=500)
 
 @auth_bp.route('/login', methods=['POST'])
 def login() -> Tuple[Dict[str, Any], int]:
-    """Handle user login."""
+    """Handle user login.
+
+    Returns the user document plus a signed session 'token' and its
+    'expiresAt'; clients authenticate later requests with
+    "Authorization: Bearer <token>".
+    """
     try:
         data = request.json
         if not data:
@@ -68,11 +87,39 @@ def login() -> Tuple[Dict[str, Any], int]:
         if not AuthService.check_password(password, user['password']):
             return create_response(error="Invalid password", status_code=401)
 
+        # Upgrade hashes made with an outdated work factor while we have the
+        # plain text password; a failure here must not fail the login
+        if AuthService.needs_rehash(user['password']):
+            try:
+                AuthService.rehash_password(user['_id'], role, password)
+            except Exception:
+                logger.exception("Password rehash failed")
+
         # Remove password from response
         del user['password']
-        
-        return create_response(user)
 
+        # Issue a session token; later requests send it as "Bearer <token>"
+        # instead of logging in again
+        session = TokenService.issue(user['_id'], role)
+        return create_response({**user, **session})
+
+    except PasswordHashingBusy as e:
+        return _busy_response(e)
+    except Exception as e:
+        logger.exception("Login error")
+        return create_response(error="Login failed", status_code=500) 
+
+@auth_bp.route('/profile', methods=['PUT'])
+@auth_required
+def update_profile() -> Tuple[Dict[str, Any], int]:
+    """Update the signed-in user's firstName, lastName or institution."""
+    try:
+        user = AuthService.update_profile(g.user['_id'], g.user['role'], request.json)
+        if not user:
+            return create_response(error="User not found", status_code=404)
+        return create_response({"user": user})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
     except Exception as e:
-        print(f"Login error: {str(e)}")
-        return create_response(error="Login failed", status_code=500) 
\ No newline at end of file
+        logger.exception("Profile update error")
+        return create_response(error="Profile update failed", status_code=500)
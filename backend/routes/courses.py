@@ -1,35 +1,80 @@
 from flask import Blueprint, request, g
 from services.course_service import CourseService
-from utils.helpers import create_response, serialize_mongo_doc
+from utils.helpers import create_response, parse_page_args, make_etag, not_modified, conditional_headers
 from typing import Tuple, Dict, Any
 import json
+import csv
+import inspect
 from functools import wraps
-from services.s3_service import S3Service
+from services.s3_service import S3Service, presign_window
+from services.material_service import MaterialService
+from services.version_stamps import (
+    VersionStamps, COURSES_KEY, teacher_courses_key, student_courses_key, course_files_key, stamp_window
+)
+from decorators import authenticate_request
+from utils.log import get_logger
 import io
 from datetime import datetime
-from config.database import course_collection, enrollment_collection, teacher_collection
+from config.database import course_collection
 from bson import ObjectId
 
 courses_bp = Blueprint('courses', __name__)
 
+logger = get_logger(__name__)
+
+# Largest number of courses accepted by one bulk request
+BULK_COURSES_MAX_ROWS = 5000
+
+# Largest bulk request body, in bytes; checked before the body is parsed
+BULK_COURSES_MAX_BYTES = 8 * 1024 * 1024
+
+# Header cells recognized as the student column of a roster CSV
+ROSTER_COLUMNS = ('studentid', 'student_id', 'id', 'email')
+
+# Page sizes for the course file listing
+FILES_PAGE_SIZE = 100
+FILES_MAX_PAGE_SIZE = 500
+
+# Page sizes for the teacher course listing
+TEACHER_COURSES_PAGE_SIZE = 100
+TEACHER_COURSES_MAX_PAGE_SIZE = 500
+
+# Page sizes for the course roster
+ROSTER_PAGE_SIZE = 100
+ROSTER_MAX_PAGE_SIZE = 500
+
+# Cheap to build: the boto3 client is created on first use or by warm_up()
 s3_service = S3Service()
 
+def _check_teacher():
+    """Authenticate a teacher, returning an error response if that fails."""
+    if not request.headers.get('Authorization'):
+        return create_response(error="No authorization provided", status_code=401)
+
+    user_data = authenticate_request()
+    if not user_data:
+        return create_response(error="Invalid authorization", status_code=401)
+    if user_data['role'] != 'teacher':
+        return create_response(error="Teacher access required", status_code=403)
+    g.user = user_data
+    return None
+
 def teacher_required(f):
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def async_decorated_function(*args, **kwargs):
+            error = _check_teacher()
+            if error:
+                return error
+            return await f(*args, **kwargs)
+        return async_decorated_function
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return create_response(error="No authorization provided", status_code=401)
-            
-        try:
-            # Extract user data from token or session
-            user_data = json.loads(auth_header)
-            if user_data['role'] != 'teacher':
-                return create_response(error="Teacher access required", status_code=403)
-            g.user = user_data
-            return f(*args, **kwargs)
-        except Exception as e:
-            return create_response(error="Invalid authorization", status_code=401)
+        error = _check_teacher()
+        if error:
+            return error
+        return f(*args, **kwargs)
     return decorated_function
 
 @courses_bp.route('/create', methods=['POST'])
@@ -58,8 +103,6 @@ def create_course() -> Tuple[Dict[str, Any], int]:
     """
     try:
         data = request.json
-        print(f"Received course creation data: {data}")  # Debug log
-        
         if not data.get('teacherId'):
             return create_response(error="teacherId is required", status_code=400)
             
@@ -69,46 +112,152 @@ def create_course() -> Tuple[Dict[str, Any], int]:
             "courseId": result['courseId']
         }, status_code=201)
     except ValueError as e:
-        print(f"Validation error: {str(e)}")  # Debug log
+        logger.info("Validation error creating course: %s", e)
         return create_response(error=str(e), status_code=400)
     except Exception as e:
-        print(f"Error creating course: {str(e)}")  # Debug log
+        logger.exception("Error creating course")
+        return create_response(error=str(e), status_code=500)
+
+def _read_bulk_rows():
+    """Read course payloads from a JSON array, {"courses": [...]} or NDJSON body.
+
+    Stops reading as soon as the body is over BULK_COURSES_MAX_BYTES or has
+    more than BULK_COURSES_MAX_ROWS rows, so an oversized request is
+    rejected without being buffered or parsed in full.
+
+    Raises:
+        ValueError: If the body is too large, has too many rows or is not a
+            list of courses
+    """
+    too_many = f"At most {BULK_COURSES_MAX_ROWS} courses per request"
+    too_large = f"Request body is over {BULK_COURSES_MAX_BYTES} bytes"
+    if request.content_length is not None and request.content_length > BULK_COURSES_MAX_BYTES:
+        raise ValueError(too_large)
+
+    if request.mimetype == 'application/x-ndjson':
+        rows = []
+        size = 0
+        for line in request.stream:
+            size += len(line)
+            if size > BULK_COURSES_MAX_BYTES:
+                raise ValueError(too_large)
+            line = line.strip()
+            if not line:
+                continue
+            if len(rows) == BULK_COURSES_MAX_ROWS:
+                raise ValueError(too_many)
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)  # Reported as an invalid row
+        return rows
+
+    data = None
+    if request.is_json:
+        # Bounded read: a chunked body has no Content-Length to check up front
+        body = request.stream.read(BULK_COURSES_MAX_BYTES + 1)
+        if len(body) > BULK_COURSES_MAX_BYTES:
+            raise ValueError(too_large)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+    if isinstance(data, dict):
+        data = data.get('courses')
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of courses or an NDJSON body")
+    if len(data) > BULK_COURSES_MAX_ROWS:
+        raise ValueError(too_many)
+    return data
+
+@courses_bp.route('/bulk', methods=['POST'])
+@teacher_required
+def create_courses_bulk() -> Tuple[Dict[str, Any], int]:
+    """Create many courses in one request.
+
+    Accepts a JSON array of course payloads (same fields as /create), an
+    object with a "courses" array, or an application/x-ndjson body with one
+    course per line. Courses are created for the authenticated teacher:
+    teacherId may be omitted, and rows naming another teacher fail.
+
+    Returns:
+        tuple: (response_data, status_code)
+            - response_data: Dict with 'created', 'failed' and per-row 'results'
+            - status_code: HTTP status code
+
+    Raises:
+        400: If the body is not a list of courses, has too many rows or is
+            over BULK_COURSES_MAX_BYTES
+        500: If the bulk insert fails
+    """
+    try:
+        rows = _read_bulk_rows()
+        results = CourseService.create_courses_bulk(rows, teacher_id=g.user['_id'])
+        failed = sum(1 for result in results if 'error' in result)
+        return create_response({
+            "created": len(results) - failed,
+            "failed": failed,
+            "results": results
+        })
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
+    except Exception as e:
+        logger.exception("Error in bulk course creation")
         return create_response(error=str(e), status_code=500)
 
 @courses_bp.route('/teacher/<teacher_id>', methods=['GET'])
 def get_teacher_courses(teacher_id: str) -> Tuple[Dict[str, Any], int]:
-    """Get all courses for a specific teacher.
+    """Get a page of the courses for a specific teacher.
     
     Args:
         teacher_id (str): The ID of the teacher
         
+    Query parameters:
+        limit (int): Page size, defaults to TEACHER_COURSES_PAGE_SIZE
+        cursor (str): nextCursor from the previous page
+        term (str): Only return courses in this term
+        year (str): Only return courses in this year
+        
+    Answers If-None-Match with 304 while the teacher's courses are unchanged,
+    within the same stamp_window().
+        
     Returns:
         tuple: (response_data, status_code)
-            - response_data: Dict containing list of courses
+            - response_data: Dict containing list of courses and nextCursor
             - status_code: HTTP status code
             
     Raises:
-        500: If fetching courses fails
+        400: If limit or cursor is invalid
     """
     try:
-        print(f"Received request for teacher: {teacher_id}")
-        
         if not teacher_id:
-            return create_response({"courses": []})
+            return create_response({"courses": [], "nextCursor": None})
             
-        courses = CourseService.get_teacher_courses(teacher_id)
-        return create_response({"courses": courses})
+        limit, after = parse_page_args(request.args, TEACHER_COURSES_PAGE_SIZE, TEACHER_COURSES_MAX_PAGE_SIZE)
+        etag = make_etag(request.full_path, VersionStamps.get([teacher_courses_key(teacher_id)]), stamp_window())
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        courses, next_cursor = CourseService.get_teacher_courses(
+            teacher_id, limit, after,
+            term=request.args.get('term'),
+            year=request.args.get('year')
+        )
+        return create_response({"courses": courses, "nextCursor": next_cursor}, headers=conditional_headers(etag))
         
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
     except Exception as e:
-        print(f"Error in get_teacher_courses route: {str(e)}")
-        return create_response({"courses": []})  # Return empty list instead of error 
+        logger.exception("Error in get_teacher_courses route")
+        return create_response({"courses": [], "nextCursor": None})  # Return empty list instead of error 
 
 @courses_bp.route('/<course_id>', methods=['GET'])
 @teacher_required
 def get_course_details(course_id: str) -> Tuple[Dict[str, Any], int]:
     """Get detailed information for a specific course."""
     try:
-        print(f"Fetching course with ID: {course_id}")
+        logger.debug("Fetching course %s", course_id)
         
         if not course_id:
             return create_response(error="Course ID is required", status_code=400)
@@ -116,7 +265,7 @@ def get_course_details(course_id: str) -> Tuple[Dict[str, Any], int]:
         try:
             course = CourseService.get_course_with_teacher(course_id)
         except Exception as e:
-            print(f"Error retrieving course: {str(e)}")
+            logger.info("Error retrieving course %s: %s", course_id, e)
             return create_response(error="Invalid course ID format", status_code=400)
             
         if not course:
@@ -125,13 +274,16 @@ def get_course_details(course_id: str) -> Tuple[Dict[str, Any], int]:
         return create_response({"course": course})
         
     except Exception as e:
-        print(f"Error in get_course_details: {str(e)}")
+        logger.exception("Error in get_course_details")
         return create_response(error="Failed to fetch course details", status_code=500) 
 
 @courses_bp.route('/<course_id>/upload', methods=['POST'])
 def upload_material(course_id):
     """Handle course material upload."""
     try:
+        if not ObjectId.is_valid(course_id):
+            return create_response(error="Invalid course ID format", status_code=400)
+
         if 'file' not in request.files:
             return create_response(error="No file provided", status_code=400)
             
@@ -150,33 +302,145 @@ def upload_material(course_id):
         if not title:
             return create_response(error="Title is required", status_code=400)
 
-        # Upload file to S3
+        # Werkzeug spools the upload to a temporary file; measure it without
+        # reading it into memory, then stream it to S3
+        file.stream.seek(0, io.SEEK_END)
+        size = file.stream.tell()
+        file.stream.seek(0)
+
         file_key = s3_service.upload_file(
-            file_data=file.read(),
+            file_data=file.stream,
             original_filename=title,
             course_id=course_id
         )
 
+        # Record it in the catalog so listings don't have to touch S3
+        MaterialService.add_material(
+            course_id=course_id,
+            file_key=file_key,
+            title=title,
+            description=description,
+            size=size
+        )
+
         return create_response({
             'message': 'Material uploaded successfully',
             'fileKey': file_key
         }, status_code=201)
 
     except Exception as e:
-        print(f"Error uploading material: {e}")
+        logger.exception("Error uploading material")
         return create_response(error="Failed to upload material", status_code=500) 
 
+@courses_bp.route('/<course_id>/uploads', methods=['POST'])
+@teacher_required
+def request_upload(course_id):
+    """Issue a presigned POST so the browser can upload a PDF directly to S3.
+
+    Expected JSON payload:
+        {
+            "title": str
+        }
+
+    Returns:
+        tuple: (response_data, status_code)
+            - response_data: Dict with 'url' and 'fields' for the form POST and
+              the reserved 'fileKey' to pass to /uploads/complete
+            - status_code: HTTP status code
+    """
+    try:
+        if not ObjectId.is_valid(course_id):
+            return create_response(error="Invalid course ID format", status_code=400)
+
+        data = request.json or {}
+        title = data.get('title')
+        if not title:
+            return create_response(error="Title is required", status_code=400)
+
+        upload = s3_service.generate_upload_post(course_id, title)
+        return create_response(upload)
+    except Exception as e:
+        logger.exception("Error issuing upload")
+        return create_response(error="Failed to start upload", status_code=500)
+
+@courses_bp.route('/<course_id>/uploads/complete', methods=['POST'])
+@teacher_required
+def complete_upload(course_id):
+    """Verify a direct-to-S3 upload and register it as course material.
+
+    Expected JSON payload:
+        {
+            "fileKey": str,
+            "title": str,
+            "description": str (optional)
+        }
+    """
+    try:
+        data = request.json or {}
+        file_key = data.get('fileKey', '')
+        title = data.get('title')
+
+        if not ObjectId.is_valid(course_id):
+            return create_response(error="Invalid course ID format", status_code=400)
+
+        # Only keys issued for this course may be registered
+        if not file_key.startswith(f"courses/{course_id}/"):
+            return create_response(error="Unauthorized access", status_code=403)
+
+        info = s3_service.get_object_info(file_key)
+        if not info:
+            return create_response(error="Uploaded file not found", status_code=404)
+        if info['contentType'] != 'application/pdf':
+            return create_response(error="Only PDF files are allowed", status_code=400)
+
+        MaterialService.add_material(
+            course_id=course_id,
+            file_key=file_key,
+            title=title or info['metadata'].get('title', file_key.split('/')[-1]),
+            description=data.get('description', ''),
+            size=info['size'],
+            uploaded_at=info['lastModified']
+        )
+
+        return create_response({
+            'message': 'Material uploaded successfully',
+            'fileKey': file_key
+        }, status_code=201)
+    except Exception as e:
+        logger.exception("Error completing upload")
+        return create_response(error="Failed to complete upload", status_code=500)
+
 @courses_bp.route('/<course_id>/files', methods=['GET'])
 @teacher_required
 def get_course_files(course_id):
-    """Get all files uploaded for a course."""
+    """Get a page of the files uploaded for a course.
+
+    Query parameters:
+        limit (int): Page size, defaults to FILES_PAGE_SIZE
+        cursor (str): nextCursor from the previous page
+
+    Answers If-None-Match with 304, before any URL is signed, while the
+    course's files are unchanged and within the same presign_window() and
+    stamp_window().
+    """
     try:
-        files = s3_service.list_course_files(course_id)
+        limit, after = parse_page_args(request.args, FILES_PAGE_SIZE, FILES_MAX_PAGE_SIZE)
+        etag = make_etag(
+            request.full_path, VersionStamps.get([course_files_key(course_id)]), presign_window(), stamp_window()
+        )
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        files, next_cursor = MaterialService.list_course_files(course_id, s3_service, limit, after)
         return create_response({
-            'files': files
-        })
+            'files': files,
+            'nextCursor': next_cursor
+        }, headers=conditional_headers(etag))
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
     except Exception as e:
-        print(f"Error getting course files: {e}")
+        logger.exception("Error getting course files")
         return create_response(error="Failed to get course files", status_code=500) 
 
 @courses_bp.route('/<course_id>/files/<path:file_key>', methods=['DELETE'])
@@ -189,50 +453,131 @@ def delete_file(course_id, file_key):
             return create_response(error="Unauthorized access", status_code=403)
 
         s3_service.delete_file(file_key)
+        MaterialService.remove_material(file_key)
         return create_response({
             'message': 'File deleted successfully'
         })
     except Exception as e:
-        print(f"Error deleting file: {e}")
+        logger.exception("Error deleting file")
         return create_response(error="Failed to delete file", status_code=500) 
 
 @courses_bp.route('/<course_id>', methods=['PUT'])
 @teacher_required
 def update_course(course_id):
+    """Update a course's editable fields."""
     try:
         data = request.json
         course = CourseService.update_course(course_id, data)
+        if not course:
+            return create_response(error="Course not found", status_code=404)
         return create_response({"course": course})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
     except Exception as e:
+        logger.exception("Error updating course")
         return create_response(error=str(e), status_code=500)
 
 @courses_bp.route('/<course_id>/students', methods=['GET'])
 @teacher_required
 def get_course_students(course_id):
+    """Get a page of the students enrolled in a course.
+
+    Query parameters:
+        limit (int): Page size, defaults to ROSTER_PAGE_SIZE
+        cursor (str): nextCursor from the previous page
+        name (str): Only return students whose first or last name starts with this
+    """
     try:
-        students = CourseService.get_course_students(course_id)
-        return create_response({"students": students})
+        limit, after = parse_page_args(request.args, ROSTER_PAGE_SIZE, ROSTER_MAX_PAGE_SIZE)
+        students, next_cursor = CourseService.get_course_students(
+            course_id, limit, after, name_prefix=request.args.get('name')
+        )
+        return create_response({"students": students, "nextCursor": next_cursor})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
     except Exception as e:
+        logger.exception("Error getting course students")
         return create_response(error=str(e), status_code=500)
 
 @courses_bp.route('/<course_id>/students/<student_id>', methods=['DELETE'])
 @teacher_required
 def remove_student(course_id, student_id):
+    """Remove a student from a course (the enrollment is marked inactive)."""
     try:
+        if not ObjectId.is_valid(course_id) or not ObjectId.is_valid(student_id):
+            return create_response(error="Invalid course or student ID format", status_code=400)
+
         CourseService.remove_student(course_id, student_id)
         return create_response({"message": "Student removed successfully"})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=404)
     except Exception as e:
+        logger.exception("Error removing student")
         return create_response(error=str(e), status_code=500) 
 
+def _iter_roster_rows(text_stream):
+    """Yield (line number, student ID or email) from a roster CSV as it is read.
+
+    The first row is treated as a header when it names a recognized column;
+    otherwise the first column of every row is used.
+    """
+    reader = csv.reader(text_stream)
+    column = 0
+    for cells in reader:
+        if reader.line_num == 1:
+            header = [cell.strip().lower() for cell in cells]
+            matches = [i for i, cell in enumerate(header) if cell in ROSTER_COLUMNS]
+            if matches:
+                column = matches[0]
+                continue
+        if column < len(cells) and cells[column].strip():
+            yield reader.line_num, cells[column].strip()
+
+@courses_bp.route('/<course_id>/roster', methods=['POST'])
+@teacher_required
+def import_roster(course_id):
+    """Enroll students from a roster CSV of student IDs or emails.
+
+    The CSV is sent either as a multipart 'file' field or as a text/csv body,
+    and is parsed as it streams in.
+
+    Returns:
+        tuple: (response_data, status_code)
+            - response_data: Dict with per-status counts and per-row 'results'
+            - status_code: HTTP status code
+    """
+    try:
+        if 'file' in request.files:
+            stream = request.files['file'].stream
+        elif request.mimetype == 'text/csv':
+            stream = request.stream
+        else:
+            return create_response(error="Roster CSV required", status_code=400)
+
+        text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        results = CourseService.import_roster(course_id, _iter_roster_rows(text_stream))
+
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return create_response({"counts": counts, "results": results})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
+    except Exception as e:
+        logger.exception("Error importing roster")
+        return create_response(error="Failed to import roster", status_code=500)
+
 @courses_bp.route('/<course_id>/code', methods=['GET'])
 @teacher_required
 def get_course_code(course_id):
     """Get course code for a specific course."""
     try:
-        course = course_collection.find_one({"_id": ObjectId(course_id)})
+        course = CourseService.get_course_code(course_id)
         if not course:
             return create_response(error="Course not found", status_code=404)
         return create_response({"courseCode": course.get("courseCode")})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=400)
     except Exception as e:
         return create_response(error=str(e), status_code=500)
 
@@ -241,12 +586,10 @@ def get_course_code(course_id):
 def generate_course_code(course_id):
     """Generate a new course code."""
     try:
-        new_code = CourseService.generate_course_code()
-        course_collection.update_one(
-            {"_id": ObjectId(course_id)},
-            {"$set": {"courseCode": new_code}}
-        )
+        new_code = CourseService.assign_course_code(course_id)
         return create_response({"courseCode": new_code})
+    except ValueError as e:
+        return create_response(error=str(e), status_code=404)
     except Exception as e:
         return create_response(error=str(e), status_code=500)
 
@@ -270,54 +613,23 @@ def enroll_with_code():
 
 @courses_bp.route('/student/<student_id>', methods=['GET'])
 def get_student_courses(student_id):
-    """Get all courses for a student."""
+    """Get all courses for a student.
+
+    Answers If-None-Match with 304 while the student's enrollments and the
+    courses' content are unchanged, within the same stamp_window().
+    """
     try:
-        print(f"Fetching courses for student: {student_id}")
-        try:
-            student_object_id = ObjectId(student_id)
-        except Exception as e:
-            print(f"Invalid student ID format: {student_id}")
-            return create_response(error="Invalid student ID format", status_code=400)
+        etag = make_etag(
+            request.full_path, VersionStamps.get([student_courses_key(student_id), COURSES_KEY]), stamp_window()
+        )
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
 
-        # Find all enrollments for this student
-        enrollments = enrollment_collection.find({
-            "studentId": student_object_id,
-            "status": "active"
-        })
-        
-        # Convert cursor to list to check if empty
-        try:
-            enrollments = list(enrollments)
-            print(f"Found {len(enrollments)} enrollments")
-        except Exception as e:
-            print(f"Error converting enrollments to list: {str(e)}")
-            return create_response(error="Error accessing enrollments", status_code=500)
-        
-        # Get course details for each enrollment
-        courses = []
-        for enrollment in enrollments:
-            try:
-                print(f"Processing enrollment: {enrollment}")
-                course = course_collection.find_one({"_id": enrollment["courseId"]})
-                print(f"Found course: {course}")
-                if course:
-                    # Get teacher info
-                    teacher = teacher_collection.find_one({"_id": course["teacherId"]})
-                    print(f"Found teacher: {teacher}")
-                    if teacher:
-                        course["teacher"] = {
-                            "firstName": teacher["firstName"],
-                            "lastName": teacher["lastName"]
-                        }
-                    courses.append(serialize_mongo_doc(course))
-            except Exception as e:
-                print(f"Error processing enrollment {enrollment}: {str(e)}")
-                continue
-        
-        print(f"Returning {len(courses)} courses")
-        return create_response({"courses": courses})
+        courses = CourseService.get_student_courses(student_id)
+        return create_response({"courses": courses}, headers=conditional_headers(etag))
+    except ValueError as e:
+        return create_response(error="Invalid student ID format", status_code=400)
     except Exception as e:
-        print(f"Error getting student courses: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error getting student courses")
         return create_response(error=str(e), status_code=500) 
\ No newline at end of file
@@ -0,0 +1,100 @@
+from typing import Dict, Any, List, Optional, Tuple
+from bson import ObjectId
+from config.async_database import get_async_db
+from config.database import course_collection, enrollment_collection, material_collection, teacher_collection
+from services.course_cache import course_cache, course_key
+from services.course_service import CourseService, COURSE_CARD_PROJECTION, TEACHER_COURSES_SORT, TEACHER_SUMMARY_FIELDS
+from services.material_service import MaterialService, MATERIAL_PROJECTION
+
+class AsyncCourseService:
+    """Async counterparts of the CourseService/MaterialService read paths.
+
+    Used by the async I/O mode views in routes/async_courses.py. Queries and
+    response shapes are shared with the sync services so both modes return
+    the same payloads.
+    """
+
+    @staticmethod
+    async def get_student_courses(student_id: str) -> List[Dict[str, Any]]:
+        """Async version of CourseService.get_student_courses."""
+        pipeline = CourseService.student_courses_pipeline(student_id)
+        db = get_async_db()
+        courses = await db[enrollment_collection.name].aggregate(pipeline).to_list(length=None)
+        return await AsyncCourseService.fill_teacher_summaries(courses)
+
+    @staticmethod
+    async def fill_teacher_summaries(courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async version of CourseService.fill_teacher_summaries."""
+        missing = CourseService.courses_without_teacher(courses)
+        if missing:
+            teachers = await get_async_db()[teacher_collection.name].find(
+                {"_id": {"$in": list({course['teacherId'] for course in missing})}},
+                {field: 1 for field in TEACHER_SUMMARY_FIELDS}
+            ).to_list(length=None)
+            summaries = {teacher["_id"]: CourseService.teacher_summary(teacher) for teacher in teachers}
+            for course in missing:
+                if course['teacherId'] in summaries:
+                    course['teacher'] = summaries[course['teacherId']]
+        return courses
+
+    @staticmethod
+    async def get_teacher_courses(
+        teacher_id: str,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+        term: Optional[str] = None,
+        year: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Async version of CourseService.get_teacher_courses."""
+        try:
+            teacher_object_id = ObjectId(teacher_id.split('...')[0])
+        except Exception:
+            return [], None
+
+        query = CourseService.teacher_courses_query(teacher_object_id, after, term, year)
+        db = get_async_db()
+        courses = await (
+            db[course_collection.name].find(query, COURSE_CARD_PROJECTION)
+            .sort(TEACHER_COURSES_SORT)
+            .limit(limit + 1)
+            .to_list(length=None)
+        )
+        return CourseService.teacher_courses_page(courses, limit)
+
+    @staticmethod
+    async def get_course_with_teacher(course_id: str) -> Optional[Dict[str, Any]]:
+        """Async version of CourseService.get_course_with_teacher."""
+        course_object_id = ObjectId(course_id.split('...')[0])
+        key = course_key(course_object_id)
+        course = course_cache.get(key)
+        if course is None:
+            course = await get_async_db()[course_collection.name].find_one({"_id": course_object_id})
+            if course:
+                course_cache.set(key, course)
+        if course:
+            await AsyncCourseService.fill_teacher_summaries([course])
+        return course
+
+    @staticmethod
+    async def list_course_files(
+        course_id: str,
+        s3_service,
+        limit: int = 100,
+        after: Optional[List[Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Async version of MaterialService.list_course_files.
+
+        URLs are signed inline: presigning is local CPU work with no S3 round
+        trip, cheaper than a hop to an executor thread per file.
+        """
+        query = MaterialService.files_query(course_id, after)
+        db = get_async_db()
+        materials = await (
+            db[material_collection.name].find(query, MATERIAL_PROJECTION)
+            .sort("_id", 1)
+            .limit(limit + 1)
+            .to_list(length=None)
+        )
+
+        urls = [s3_service.generate_presigned_url(material['key']) for material in materials[:limit]]
+        return MaterialService.files_page(materials, urls, limit)
@@ -2,8 +2,62 @@ import bcrypt
 from typing import Dict, Any, Optional, Tuple
 from bson import ObjectId
 from bson.objectid import ObjectId
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from config.database import teacher_collection, student_collection
+from services.course_service import CourseService, TEACHER_SUMMARY_FIELDS
 from utils.helpers import serialize_object_id
+from utils.log import get_logger
+import os
+import threading
+
+# bcrypt work factor for new hashes; existing hashes with a different cost are
+# rehashed on the next successful login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+
+# bcrypt runs on a dedicated pool (it releases the GIL) so hashing can't starve
+# request threads. At most BCRYPT_POOL_SIZE hashes run at once and
+# BCRYPT_QUEUE_SIZE more may wait; beyond that requests fail fast with a 503.
+BCRYPT_POOL_SIZE = int(os.getenv('BCRYPT_POOL_SIZE', str(os.cpu_count() or 2)))
+BCRYPT_QUEUE_SIZE = int(os.getenv('BCRYPT_QUEUE_SIZE', str(BCRYPT_POOL_SIZE * 4)))
+BCRYPT_RETRY_AFTER = int(os.getenv('BCRYPT_RETRY_AFTER', '1'))
+
+# Profile fields a user may change after registering
+UPDATABLE_PROFILE_FIELDS = ['firstName', 'lastName', 'institution']
+
+logger = get_logger(__name__)
+
+class PasswordHashingBusy(Exception):
+    """Raised when the bcrypt pool has no free slot for another hash."""
+
+_pool = None
+_pool_pid = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+
+def _run_bcrypt(func, *args):
+    """Run a bcrypt call on the bounded pool and wait for its result.
+
+    Raises:
+        PasswordHashingBusy: If the pool and its queue are full
+    """
+    global _pool, _pool_pid, _pool_slots
+    # Build the pool lazily, and again after a fork: worker threads don't
+    # survive into a child process
+    if _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool_pid != os.getpid():
+                _pool = ThreadPoolExecutor(max_workers=BCRYPT_POOL_SIZE, thread_name_prefix='bcrypt')
+                _pool_slots = threading.BoundedSemaphore(BCRYPT_POOL_SIZE + BCRYPT_QUEUE_SIZE)
+                _pool_pid = os.getpid()
+
+    if not _pool_slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Password hashing is busy, try again shortly")
+    try:
+        return _pool.submit(func, *args).result()
+    finally:
+        _pool_slots.release()
 
 class AuthService:
     @staticmethod
@@ -16,10 +70,13 @@ class AuthService:
         Returns:
             bytes: The hashed password
             
+        Raises:
+            PasswordHashingBusy: If the bcrypt pool is saturated
+            
         Example:
             >>> hashed = AuthService.hash_password("mypassword123!")
         """
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        return _run_bcrypt(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS))
 
     @staticmethod
     def check_password(password: str, hashed: bytes) -> bool:
@@ -32,15 +89,92 @@ class AuthService:
         Returns:
             bool: True if password matches, False otherwise
             
+        Raises:
+            PasswordHashingBusy: If the bcrypt pool is saturated
+            
         Example:
             >>> is_valid = AuthService.check_password("mypassword123!", hashed_password)
         """
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed)
-        except Exception as e:
-            print(f"Error checking password: {str(e)}")
+            return _run_bcrypt(bcrypt.checkpw, password.encode('utf-8'), hashed)
+        except PasswordHashingBusy:
+            raise
+        except Exception:
+            logger.exception("Error checking password")
+            return False
+
+    @staticmethod
+    def needs_rehash(hashed: bytes) -> bool:
+        """Check whether a hash was made with a cost other than BCRYPT_ROUNDS.
+        
+        Example:
+            >>> AuthService.needs_rehash(b"$2b$10$...")  # with BCRYPT_ROUNDS = 12
+            True
+        """
+        try:
+            return int(hashed.split(b'$')[2]) != BCRYPT_ROUNDS
+        except (IndexError, ValueError):
             return False
 
+    @staticmethod
+    def rehash_password(user_id: str, role: str, password: str) -> None:
+        """Store a fresh hash of a verified password at the current work factor.
+        
+        Args:
+            user_id (str): The ID of the user
+            role (str): The role of the user ('teacher' or 'student')
+            password (str): The plain text password that was just verified
+        """
+        collection = teacher_collection if role == 'teacher' else student_collection
+        collection.update_one(
+            {"_id": ObjectId(user_id)},
+            {"$set": {"password": AuthService.hash_password(password)}}
+        )
+
+    @staticmethod
+    def update_profile(user_id: str, role: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update a user's profile fields.
+        
+        When a teacher's name changes, the teacher summary stored on each of
+        their courses is rewritten too (CourseService.update_teacher_summary).
+        If that fan-out fails the profile change stands and the courses are
+        left for `manage.py check-teacher-summaries --repair`.
+        
+        Args:
+            user_id (str): The ID of the user
+            role (str): The role of the user ('teacher' or 'student')
+            updates (Dict[str, Any]): New values; only UPDATABLE_PROFILE_FIELDS
+                are applied
+            
+        Returns:
+            Optional[Dict[str, Any]]: The updated user without its password,
+                None if the user does not exist
+            
+        Raises:
+            ValueError: If user_id is invalid or no updatable field is given
+        """
+        if not ObjectId.is_valid(user_id):
+            raise ValueError(f"Invalid user ID format: {user_id}")
+        if not isinstance(updates, dict):
+            raise ValueError("Profile updates must be a JSON object")
+        changes = {field: updates[field] for field in UPDATABLE_PROFILE_FIELDS if field in updates}
+        if not changes:
+            raise ValueError(f"No updatable fields given; expected one of {', '.join(UPDATABLE_PROFILE_FIELDS)}")
+
+        collection = teacher_collection if role == 'teacher' else student_collection
+        user = collection.find_one_and_update(
+            {"_id": ObjectId(user_id)},
+            {"$set": changes},
+            projection={"password": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if user and role == 'teacher' and any(field in changes for field in TEACHER_SUMMARY_FIELDS):
+            try:
+                CourseService.update_teacher_summary(user['_id'], user)
+            except Exception:
+                logger.exception("Teacher summary fan-out failed for teacher %s", user_id)
+        return user
+
     @staticmethod
     def get_user_by_username(username: str, role: str) -> Optional[Dict[str, Any]]:
         """Retrieve a user by their username and role.
@@ -78,11 +212,11 @@ class AuthService:
                 # Add back the password hash for verification
                 serialized_user['password'] = password_hash
                 
-                print(f"Found user: {username}, role: {role}")
+                logger.debug("Found user %s, role %s", username, role)
                 return serialized_user
             return None
-        except Exception as e:
-            print(f"Error in get_user_by_username: {str(e)}")
+        except Exception:
+            logger.exception("Error in get_user_by_username")
             raise
 
     @staticmethod
@@ -102,6 +236,7 @@ class AuthService:
             Dict[str, Any]: Dictionary containing the created user's ID
             
         Raises:
+            ValueError: If the username or email is already taken
             Exception: If database operation fails
             
         Example:
@@ -116,7 +251,14 @@ class AuthService:
         """
         collection = teacher_collection if user_data['role'] == 'teacher' else student_collection
         user_data['password'] = AuthService.hash_password(user_data['password'])
-        result = collection.insert_one(user_data)
+        try:
+            result = collection.insert_one(user_data)
+        except DuplicateKeyError as e:
+            # Both username and email are unique; report the one that collided
+            key_pattern = (e.details or {}).get('keyPattern') or {}
+            if 'email' in key_pattern:
+                raise ValueError("Email already registered")
+            raise ValueError("Username already exists")
         return {"userId": str(result.inserted_id)}
 
     @staticmethod
@@ -141,16 +283,19 @@ class AuthService:
                 'role': 'teacher'
             }
             
-            result = teacher_collection.insert_one(teacher_data)
+            try:
+                result = teacher_collection.insert_one(teacher_data)
+            except DuplicateKeyError:
+                raise ValueError("Email already registered")
             teacher_data['_id'] = str(result.inserted_id)
             del teacher_data['password']
             return teacher_data
             
         except ValueError as e:
-            print(f"Validation error in register_teacher: {str(e)}")
+            logger.info("Validation error in register_teacher: %s", e)
             raise
-        except Exception as e:
-            print(f"Error in register_teacher: {str(e)}")
+        except Exception:
+            logger.exception("Error in register_teacher")
             raise
 
     @staticmethod
@@ -175,14 +320,17 @@ class AuthService:
                 'role': 'student'
             }
             
-            result = student_collection.insert_one(student_data)
+            try:
+                result = student_collection.insert_one(student_data)
+            except DuplicateKeyError:
+                raise ValueError("Email already registered")
             student_data['_id'] = str(result.inserted_id)
             del student_data['password']
             return student_data
             
         except ValueError as e:
-            print(f"Validation error in register_student: {str(e)}")
+            logger.info("Validation error in register_student: %s", e)
             raise
-        except Exception as e:
-            print(f"Error in register_student: {str(e)}")
+        except Exception:
+            logger.exception("Error in register_student")
             raise 
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Read-through cache for course documents.
+
+Course documents are read on every course detail page and almost never
+change, so CourseService keeps them in an in-process TTL+LRU cache and, when
+COURSE_CACHE_REDIS_URL is set, in a Redis instance shared by every worker.
+Every CourseService write path invalidates the course it touched.
+
+Entries are stored BSON-encoded, so ObjectIds and datetimes round-trip and
+callers always get a fresh copy they are free to modify.
+
+Each worker process has its own in-process layer, and a write only
+invalidates the copy in the worker that handled it, so that layer keeps
+entries for at most COURSE_CACHE_LOCAL_TTL seconds: other workers serve an
+edited course for no longer than that. The shared layer is invalidated by
+every write and keeps entries for COURSE_CACHE_TTL seconds. Reads that must
+see a write made moments earlier (such as a regenerated course code) go to
+the database instead.
+
+Environment Variables:
+    COURSE_CACHE_SIZE (int): Entries kept in process, defaults to 10000
+    COURSE_CACHE_TTL (int): Seconds an entry lives in the shared layer,
+        defaults to 300
+    COURSE_CACHE_REDIS_URL (str): Optional Redis URL for the shared layer
+        (needs the redis package)
+    COURSE_CACHE_LOCAL_TTL (int): Seconds an entry lives in process, capped at
+        COURSE_CACHE_TTL, defaults to 5
+"""
+
+from typing import Any, Dict, Optional
+import os
+import threading
+import bson
+from utils.cache import TTLCache
+from utils.log import get_logger
+from utils.metrics import CACHE_REQUESTS
+
+logger = get_logger(__name__)
+
+COURSE_CACHE_SIZE = int(os.getenv('COURSE_CACHE_SIZE', '10000'))
+COURSE_CACHE_TTL = int(os.getenv('COURSE_CACHE_TTL', '300'))
+COURSE_CACHE_REDIS_URL = os.getenv('COURSE_CACHE_REDIS_URL')
+COURSE_CACHE_LOCAL_TTL = int(os.getenv('COURSE_CACHE_LOCAL_TTL', '5'))
+
+class CourseCache:
+    """Two-level cache of BSON documents keyed by string.
+
+    Example:
+        >>> cache = CourseCache(maxsize=1000, ttl=300, local_ttl=5)
+        >>> cache.set("course:507f1f77bcf86cd799439011", course)
+        >>> cache.get("course:507f1f77bcf86cd799439011")
+    """
+
+    def __init__(self, maxsize: int, ttl: int, redis_url: Optional[str] = None, local_ttl: Optional[int] = None):
+        """
+        Args:
+            maxsize (int): Entries kept in process
+            ttl (int): Lifetime of an entry in seconds
+            redis_url (Optional[str]): Shared Redis layer, None to disable
+            local_ttl (Optional[int]): In-process lifetime, capped at ttl;
+                None to keep entries for ttl
+        """
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.local = TTLCache(maxsize=maxsize, ttl=min(ttl, local_ttl or ttl))
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self._redis = None
+        self._redis_pid = None
+        self._redis_lock = threading.Lock()
+
+    def _shared(self):
+        """Return the Redis client, connecting lazily (and again after a fork)."""
+        if not self.redis_url:
+            return None
+        if self._redis_pid != os.getpid():
+            with self._redis_lock:
+                if self._redis_pid != os.getpid():
+                    try:
+                        import redis
+                    except ImportError:
+                        raise RuntimeError("COURSE_CACHE_REDIS_URL is set but the redis package is not installed")
+                    self._redis = redis.Redis.from_url(self.redis_url)
+                    self._redis_pid = os.getpid()
+        return self._redis
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached document, or None on a miss."""
+        raw = self.local.get(key)
+        if raw is not None:
+            CACHE_REQUESTS.labels('course', 'hit').inc()
+            return bson.decode(raw)
+
+        shared = self._shared()
+        if shared is not None:
+            try:
+                raw = shared.get(key)
+            except Exception as e:
+                logger.warning("Course cache read failed: %s", e)
+                raw = None
+            if raw is not None:
+                self.shared_hits += 1
+                CACHE_REQUESTS.labels('course', 'hit').inc()
+                self.local.set(key, raw)
+                return bson.decode(raw)
+            self.shared_misses += 1
+
+        CACHE_REQUESTS.labels('course', 'miss').inc()
+        return None
+
+    def set(self, key: str, document: Dict[str, Any]) -> None:
+        """Cache a document in every layer."""
+        raw = bson.encode(document)
+        self.local.set(key, raw)
+        shared = self._shared()
+        if shared is not None:
+            try:
+                shared.set(key, raw, ex=self.ttl)
+            except Exception as e:
+                logger.warning("Course cache write failed: %s", e)
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop entries from every layer."""
+        for key in keys:
+            self.local.pop(key)
+        shared = self._shared()
+        if shared is not None and keys:
+            try:
+                shared.delete(*keys)
+            except Exception as e:
+                logger.warning("Course cache invalidation failed: %s", e)
+
+    def clear(self) -> None:
+        """Drop every in-process entry (the shared layer expires on its own)."""
+        self.local.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process."""
+        return {
+            'hits': self.local.hits + self.shared_hits,
+            'misses': self.shared_misses if self.redis_url else self.local.misses,
+            'localHits': self.local.hits,
+            'sharedHits': self.shared_hits,
+            'size': len(self.local)
+        }
+
+course_cache = CourseCache(
+    maxsize=COURSE_CACHE_SIZE,
+    ttl=COURSE_CACHE_TTL,
+    redis_url=COURSE_CACHE_REDIS_URL,
+    local_ttl=COURSE_CACHE_LOCAL_TTL
+)
+
+def course_key(course_id: Any) -> str:
+    return f"course:{course_id}"
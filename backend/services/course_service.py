@@ -1,21 +1,150 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Optional, Tuple
 from bson import ObjectId
-from config.database import course_collection, teacher_collection, enrollment_collection
-from utils.helpers import serialize_object_id
-from utils.helpers import serialize_mongo_doc
+from pymongo import UpdateOne, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from config.database import course_collection, teacher_collection, enrollment_collection, student_collection
+from config.indexes import EMAIL_COLLATION
+from services.course_cache import course_cache, course_key
+from services.version_stamps import VersionStamps, COURSES_KEY, teacher_courses_key, student_courses_key
+from utils.helpers import encode_cursor
+from utils.log import get_logger
 import random
+import re
 import string
 from datetime import datetime
 
+# Attempts before giving up on finding a free course code. With 36^6 codes a
+# collision is rare, so almost every allocation succeeds on the first write.
+COURSE_CODE_MAX_ATTEMPTS = 5
+
+# Roster rows resolved and written per round trip
+ROSTER_BATCH_SIZE = 1000
+
+REQUIRED_COURSE_FIELDS = ['courseName', 'department', 'courseNumber', 'term', 'year', 'teacherId', 'institution']
+
+# Fields a teacher may change after creating a course
+UPDATABLE_COURSE_FIELDS = ['courseName', 'department', 'courseNumber', 'term', 'year', 'institution', 'description']
+
+# Fields shown on a course card in teacher listings
+COURSE_CARD_PROJECTION = {
+    "courseName": 1, "department": 1, "courseNumber": 1, "term": 1, "year": 1,
+    "institution": 1, "courseCode": 1, "teacherId": 1
+}
+
+# Teacher fields denormalized onto each course as its 'teacher' summary
+TEACHER_SUMMARY_FIELDS = ['firstName', 'lastName']
+
+# Teachers checked per round trip by check_teacher_summaries
+TEACHER_SUMMARY_BATCH_SIZE = 500
+
+# Student fields returned by the course roster
+ROSTER_STUDENT_PROJECTION = {"firstName": 1, "lastName": 1, "email": 1}
+
+# Teacher listings are newest first; the order matches the
+# teacherId_year_term_id index so pages are read straight off it
+TEACHER_COURSES_SORT = [("year", DESCENDING), ("term", DESCENDING), ("_id", DESCENDING)]
+
+logger = get_logger(__name__)
+
 class CourseService:
     @staticmethod
     def generate_course_code():
-        """Generate a unique 6-character course code."""
-        while True:
-            code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            # Check if code already exists
-            if not course_collection.find_one({"courseCode": code}):
-                return code
+        """Generate a random 6-character course code candidate.
+
+        Uniqueness is enforced by the unique index on courseCode; callers
+        write the code and retry with a new candidate on a duplicate key.
+        """
+        return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+
+    @staticmethod
+    def _is_course_code_conflict(error: DuplicateKeyError) -> bool:
+        # Servers that don't report keyPattern are treated as a code conflict;
+        # courseCode is the only unique key besides _id on courseCatalog
+        key_pattern = (error.details or {}).get('keyPattern')
+        return key_pattern is None or 'courseCode' in key_pattern
+
+    @staticmethod
+    def insert_course_with_code(course_data: Dict[str, Any]) -> str:
+        """Insert a course with a freshly allocated course code.
+
+        Args:
+            course_data (Dict[str, Any]): Validated course document
+
+        Returns:
+            str: The inserted course's ID
+
+        Raises:
+            Exception: If no free code was found within COURSE_CODE_MAX_ATTEMPTS
+        """
+        for _ in range(COURSE_CODE_MAX_ATTEMPTS):
+            course_data["courseCode"] = CourseService.generate_course_code()
+            try:
+                result = course_collection.insert_one(course_data)
+                return str(result.inserted_id)
+            except DuplicateKeyError as e:
+                if not CourseService._is_course_code_conflict(e):
+                    raise
+        raise Exception("Could not allocate a unique course code")
+
+    @staticmethod
+    def assign_course_code(course_id: str) -> str:
+        """Replace a course's code with a freshly allocated one.
+
+        Args:
+            course_id (str): The ID of the course
+
+        Returns:
+            str: The new course code
+
+        Raises:
+            ValueError: If the course does not exist
+            Exception: If no free code was found within COURSE_CODE_MAX_ATTEMPTS
+        """
+        course_object_id = ObjectId(course_id)
+        for _ in range(COURSE_CODE_MAX_ATTEMPTS):
+            code = CourseService.generate_course_code()
+            try:
+                course = course_collection.find_one_and_update(
+                    {"_id": course_object_id},
+                    {"$set": {"courseCode": code}},
+                    projection={"teacherId": 1}
+                )
+            except DuplicateKeyError as e:
+                if not CourseService._is_course_code_conflict(e):
+                    raise
+                continue
+            if course is None:
+                raise ValueError("Course not found")
+            course_cache.invalidate(course_key(course_object_id))
+            VersionStamps.bump(teacher_courses_key(course.get("teacherId")), COURSES_KEY)
+            return code
+        raise Exception("Could not allocate a unique course code")
+
+    @staticmethod
+    def validate_course_data(course_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Check required course fields and convert teacherId to an ObjectId.
+
+        Args:
+            course_data (Dict[str, Any]): Course payload, modified in place
+
+        Returns:
+            Dict[str, Any]: The validated course document
+
+        Raises:
+            ValueError: If a required field is missing or teacherId is invalid
+        """
+        if not isinstance(course_data, dict):
+            raise ValueError("Course must be a JSON object")
+
+        for field in REQUIRED_COURSE_FIELDS:
+            if field not in course_data:
+                raise ValueError(f"Missing required field: {field}")
+
+        try:
+            course_data['teacherId'] = ObjectId(course_data['teacherId'])
+        except Exception:
+            raise ValueError(f"Invalid teacherId format: {course_data.get('teacherId', 'missing')}")
+        return course_data
 
     @staticmethod
     def create_course(course_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -31,11 +160,14 @@ class CourseService:
                 - teacherId (str): ID of the teacher
                 - institution (str): Institution name
                 
+        The teacher's name is copied onto the course as its 'teacher' summary,
+        so course reads need no join against teacherDirectory.
+                
         Returns:
             Dict[str, Any]: Dictionary containing the created course's ID
             
         Raises:
-            ValueError: If required fields are missing
+            ValueError: If required fields are missing or the teacher does not exist
             Exception: If database operation fails
             
         Example:
@@ -50,75 +182,253 @@ class CourseService:
             ... })
         """
         try:
-            # Validate required fields
-            required_fields = ['courseName', 'department', 'courseNumber', 'term', 'year', 'teacherId', 'institution']
-            for field in required_fields:
-                if field not in course_data:
-                    raise ValueError(f"Missing required field: {field}")
-            
-            # Convert teacherId to ObjectId
-            try:
-                course_data['teacherId'] = ObjectId(course_data['teacherId'])
-            except Exception as e:
-                raise ValueError(f"Invalid teacherId format: {course_data.get('teacherId', 'missing')}")
-
-            course_data["courseCode"] = CourseService.generate_course_code()
-            result = course_collection.insert_one(course_data)
-            return {"courseId": str(result.inserted_id)}
+            CourseService.validate_course_data(course_data)
+            summaries = CourseService.load_teacher_summaries([course_data['teacherId']])
+            if course_data['teacherId'] not in summaries:
+                raise ValueError("Teacher not found")
+            course_data['teacher'] = summaries[course_data['teacherId']]
+            course_id = CourseService.insert_course_with_code(course_data)
+            VersionStamps.bump(teacher_courses_key(course_data['teacherId']))
+            return {"courseId": course_id}
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to create course: {str(e)}")
 
     @staticmethod
-    def get_teacher_courses(teacher_id: str) -> List[Dict[str, Any]]:
-        """Get all courses taught by a specific teacher.
+    def create_courses_bulk(rows: Iterable[Any], teacher_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Validate and insert a batch of courses with one unordered insert_many.
+
+        Rows are validated with the same rules as create_course, and the
+        teacher summaries of the whole batch are read in one query. With
+        `teacher_id`, rows without a teacherId are created for that teacher
+        and rows naming any other teacher are rejected. Codes are
+        drawn for the whole batch up front (unique within the batch); rows
+        whose code collides with an existing course are re-drawn and retried
+        together, so a batch costs one round trip in the common case.
+
+        Args:
+            rows (Iterable[Any]): Course payloads, in request order
+            teacher_id (Optional[str]): The only teacher the rows may create
+                courses for, usually the authenticated teacher
+
+        Returns:
+            List[Dict[str, Any]]: One result per row, in order, with 'row' and
+                either 'courseId'/'courseCode' or 'error'
+        """
+        results = []
+        pending = {}  # results index -> course document awaiting insert
+        for row, course_data in enumerate(rows):
+            try:
+                if teacher_id is not None and isinstance(course_data, dict):
+                    course_data.setdefault('teacherId', teacher_id)
+                    if str(course_data['teacherId']) != str(teacher_id):
+                        raise ValueError("Courses can only be created for the authenticated teacher")
+                pending[row] = CourseService.validate_course_data(course_data)
+                results.append({"row": row})
+            except ValueError as e:
+                results.append({"row": row, "error": str(e)})
+
+        summaries = CourseService.load_teacher_summaries(course['teacherId'] for course in pending.values())
+        for row in list(pending):
+            summary = summaries.get(pending[row]['teacherId'])
+            if summary is None:
+                results[row]["error"] = "Teacher not found"
+                del pending[row]
+            else:
+                pending[row]['teacher'] = summary
+
+        teacher_ids = set()
+        for _ in range(COURSE_CODE_MAX_ATTEMPTS):
+            if not pending:
+                break
+
+            used_codes = set()
+            for course in pending.values():
+                code = CourseService.generate_course_code()
+                while code in used_codes:
+                    code = CourseService.generate_course_code()
+                used_codes.add(code)
+                course["courseCode"] = code
+
+            rows_in_batch = list(pending)
+            retry = {}
+            try:
+                course_collection.insert_many([pending[row] for row in rows_in_batch], ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get('writeErrors', []):
+                    row = rows_in_batch[write_error['index']]
+                    if write_error.get('code') == 11000 and 'courseCode' in write_error.get('keyPattern', {'courseCode': 1}):
+                        retry[row] = pending[row]
+                    else:
+                        results[row]["error"] = write_error.get('errmsg', 'Failed to create course')
+
+            for row in rows_in_batch:
+                if row not in retry and "error" not in results[row]:
+                    course = pending[row]
+                    results[row].update({"courseId": str(course["_id"]), "courseCode": course["courseCode"]})
+                    teacher_ids.add(course["teacherId"])
+            pending = retry
+
+        VersionStamps.bump(*(teacher_courses_key(teacher_id) for teacher_id in teacher_ids))
+
+        for row in pending:
+            results[row]["error"] = "Could not allocate a unique course code"
+        return results
+
+    @staticmethod
+    def teacher_courses_query(
+        teacher_object_id: ObjectId,
+        after: Optional[List[Any]] = None,
+        term: Optional[str] = None,
+        year: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the query for a page of a teacher's courses.
+
+        Pages are ordered by TEACHER_COURSES_SORT, so the cursor holds the
+        (year, term, _id) of the last course on the previous page.
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = {"teacherId": teacher_object_id}
+        if year:
+            query["year"] = year
+        if term:
+            query["term"] = term
+        if after:
+            if len(after) != 3 or not isinstance(after[2], ObjectId):
+                raise ValueError("Invalid cursor")
+            last_year, last_term, last_id = after
+            query["$or"] = [
+                {"year": {"$lt": last_year}},
+                {"year": last_year, "term": {"$lt": last_term}},
+                {"year": last_year, "term": last_term, "_id": {"$lt": last_id}}
+            ]
+        return query
+
+    @staticmethod
+    def teacher_courses_page(
+        courses: List[Dict[str, Any]],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Split up to limit + 1 courses into a page and the next page's cursor."""
+        if len(courses) <= limit:
+            return courses, None
+        last = courses[limit - 1]
+        return courses[:limit], encode_cursor([last.get('year'), last.get('term'), last['_id']])
+
+    @staticmethod
+    def update_course(course_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update a course's editable fields.
+
+        Args:
+            course_id (str): The ID of the course
+            updates (Dict[str, Any]): New values; only UPDATABLE_COURSE_FIELDS
+                are applied
+
+        Returns:
+            Optional[Dict[str, Any]]: The updated course, None if it does not exist
+
+        Raises:
+            ValueError: If course_id is invalid or no updatable field is given
+
+        Example:
+            >>> course = CourseService.update_course("507f1f77bcf86cd799439011", {"term": "Spring"})
+        """
+        try:
+            course_object_id = ObjectId(course_id)
+        except Exception:
+            raise ValueError(f"Invalid course ID format: {course_id}")
+        if not isinstance(updates, dict):
+            raise ValueError("Course updates must be a JSON object")
+
+        changes = {field: updates[field] for field in UPDATABLE_COURSE_FIELDS if field in updates}
+        if not changes:
+            raise ValueError(f"No updatable fields given; expected one of {', '.join(UPDATABLE_COURSE_FIELDS)}")
+
+        course = course_collection.find_one_and_update(
+            {"_id": course_object_id},
+            {"$set": changes},
+            return_document=ReturnDocument.AFTER
+        )
+        course_cache.invalidate(course_key(course_object_id))
+        if course:
+            VersionStamps.bump(teacher_courses_key(course.get("teacherId")), COURSES_KEY)
+        return course
+
+    @staticmethod
+    def get_teacher_courses(
+        teacher_id: str,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+        term: Optional[str] = None,
+        year: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of the courses taught by a specific teacher.
+        
+        Only the card fields (COURSE_CARD_PROJECTION) are returned, newest
+        year first. Served by the teacherId_year_term_id index, including
+        when filtered by year, or by year and term.
         
         Args:
             teacher_id (str): The ID of the teacher
+            limit (int): Maximum number of courses to return
+            after (Optional[List[Any]]): Decoded cursor from the previous page
+            term (Optional[str]): Only return courses in this term
+            year (Optional[str]): Only return courses in this year
             
         Returns:
-            List[Dict[str, Any]]: List of courses taught by the teacher
+            tuple: (courses, next_cursor) where next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is invalid
             
         Example:
-            >>> courses = CourseService.get_teacher_courses("507f1f77bcf86cd799439011")
+            >>> courses, cursor = CourseService.get_teacher_courses("507f1f77bcf86cd799439011", limit=20)
         """
         try:
-            print(f"Raw teacher_id received: {teacher_id}")
-            
             # Clean up the ID - remove any truncation
             teacher_id = teacher_id.split('...')[0]
             
             try:
                 teacher_object_id = ObjectId(teacher_id)
-            except Exception as e:
-                print(f"Failed to convert to ObjectId: {teacher_id}")
-                return []  # Return empty list instead of raising error
+            except Exception:
+                logger.info("Invalid teacher ID: %s", teacher_id)
+                return [], None  # Return empty list instead of raising error
             
-            print(f"Querying with teacher_id: {teacher_object_id}")
+            query = CourseService.teacher_courses_query(teacher_object_id, after, term, year)
+            courses = list(
+                course_collection.find(query, COURSE_CARD_PROJECTION)
+                .sort(TEACHER_COURSES_SORT)
+                .limit(limit + 1)
+            )
+            logger.debug("Found %d courses for teacher %s", len(courses), teacher_object_id)
+            return CourseService.teacher_courses_page(courses, limit)
             
-            # Try to find courses
-            courses = list(course_collection.find({"teacherId": teacher_object_id}))
-            print(f"Found {len(courses)} courses for teacher")
-            
-            # Convert ObjectIds to strings in the response
-            serialized_courses = []
-            for course in courses:
-                serialized_course = {
-                    **course,
-                    '_id': str(course['_id']),
-                    'teacherId': str(course['teacherId'])
-                }
-                serialized_courses.append(serialized_course)
-            
-            return serialized_courses
-            
-        except Exception as e:
-            print(f"Error in get_teacher_courses: {str(e)}")
-            return []  # Return empty list on error
+        except ValueError:
+            raise
+        except Exception:
+            logger.exception("Error in get_teacher_courses")
+            return [], None  # Return empty list on error
+
+    @staticmethod
+    def _load_course(course_object_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """Read a course through the course cache."""
+        key = course_key(course_object_id)
+        course = course_cache.get(key)
+        if course is None:
+            course = course_collection.find_one({"_id": course_object_id})
+            if course:
+                course_cache.set(key, course)
+        return course
 
     @staticmethod
     def get_course(course_id: str) -> Dict[str, Any]:
         """Get a specific course by its ID.
         
+        Served from the course cache when possible.
+        
         Args:
             course_id (str): The ID of the course to retrieve
             
@@ -135,65 +445,225 @@ class CourseService:
             # Convert to ObjectId
             course_object_id = ObjectId(course_id)
             
-            # Find the course
-            course = course_collection.find_one({"_id": course_object_id})
-            if not course:
-                return None
-            
-            # Convert ObjectIds to strings in the response
-            serialized_course = {
-                **course,
-                '_id': str(course['_id']),
-                'teacherId': str(course['teacherId'])
-            }
-            
-            print(f"Found course: {serialized_course}")
-            return serialized_course
+            return CourseService._load_course(course_object_id)
             
         except Exception as e:
-            print(f"Error in get_course: {str(e)}")
+            logger.warning("Error in get_course: %s", e)
             raise 
 
+    @staticmethod
+    def get_course_code(course_id: str) -> Optional[Dict[str, Any]]:
+        """Read a course's join code straight from the database.
+
+        Bypasses the course cache: a teacher reads the code right after
+        regenerating it, and the read may land on a worker whose cached copy
+        still has the old one.
+
+        Args:
+            course_id (str): The ID of the course
+
+        Returns:
+            Optional[Dict[str, Any]]: The course's _id and courseCode, None if
+                the course does not exist
+
+        Raises:
+            ValueError: If course_id is not a valid ObjectId
+        """
+        try:
+            course_object_id = ObjectId(course_id)
+        except Exception:
+            raise ValueError(f"Invalid course ID format: {course_id}")
+        return course_collection.find_one({"_id": course_object_id}, {"courseCode": 1})
+
     @staticmethod
     def get_course_with_teacher(course_id: str) -> Dict[str, Any]:
         """Get a course and its teacher's information.
         
+        The teacher's name is stored on the course document (see
+        update_teacher_summary), so this is a single read, served from the
+        course cache when possible. Courses stored without the name are
+        completed by fill_teacher_summaries.
+        
         Args:
             course_id (str): The ID of the course
             
         Returns:
-            Dict[str, Any]: Course and teacher information if found, None otherwise
+            Dict[str, Any]: Course information with a 'teacher' entry holding
+                firstName/lastName if found, None otherwise
         """
         try:
             course_id = course_id.split('...')[0]
-            course_object_id = ObjectId(course_id)
-            
-            # Get the course
-            course = course_collection.find_one({"_id": course_object_id})
-            if not course:
-                return None
-            
-            # Get the teacher
-            teacher = teacher_collection.find_one({"_id": course['teacherId']})
-            if teacher:
-                course['teacher'] = {
-                    'firstName': teacher['firstName'],
-                    'lastName': teacher['lastName']
-                }
-            
-            # Convert ObjectIds to strings
-            serialized_course = {
-                **course,
-                '_id': str(course['_id']),
-                'teacherId': str(course['teacherId'])
-            }
-            
-            return serialized_course
-            
+            course = CourseService._load_course(ObjectId(course_id))
+            if course:
+                CourseService.fill_teacher_summaries([course])
+            return course
         except Exception as e:
-            print(f"Error in get_course_with_teacher: {str(e)}")
+            logger.warning("Error in get_course_with_teacher: %s", e)
             raise 
 
+    @staticmethod
+    def teacher_summary(teacher: Dict[str, Any]) -> Dict[str, Any]:
+        """The part of a teacher document that is copied onto their courses."""
+        return {field: teacher.get(field) for field in TEACHER_SUMMARY_FIELDS}
+
+    @staticmethod
+    def load_teacher_summaries(teacher_ids: Iterable[ObjectId]) -> Dict[ObjectId, Dict[str, Any]]:
+        """Read the summaries of several teachers in one query, keyed by teacher ID."""
+        teachers = teacher_collection.find(
+            {"_id": {"$in": list(set(teacher_ids))}},
+            {field: 1 for field in TEACHER_SUMMARY_FIELDS}
+        )
+        return {teacher["_id"]: CourseService.teacher_summary(teacher) for teacher in teachers}
+
+    @staticmethod
+    def courses_without_teacher(courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The courses stored without a teacher summary.
+
+        Courses created before names were copied onto courses have none until
+        `manage.py check-teacher-summaries --repair` backfills them.
+        """
+        return [course for course in courses if 'teacher' not in course and course.get('teacherId')]
+
+    @staticmethod
+    def fill_teacher_summaries(courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add the teacher summary to courses stored without one, in place.
+
+        Reads the missing summaries in one query; once every course has been
+        backfilled this makes no query at all.
+        """
+        missing = CourseService.courses_without_teacher(courses)
+        if missing:
+            summaries = CourseService.load_teacher_summaries(course['teacherId'] for course in missing)
+            for course in missing:
+                if course['teacherId'] in summaries:
+                    course['teacher'] = summaries[course['teacherId']]
+        return courses
+
+    @staticmethod
+    def update_teacher_summary(teacher_id: ObjectId, teacher: Dict[str, Any]) -> int:
+        """Rewrite the teacher summary on every course of a teacher.
+
+        Called after a teacher's name changes. The fan-out is one update_many
+        on the teacherId index; courses that already carry the current
+        summary are not rewritten.
+
+        Args:
+            teacher_id (ObjectId): The teacher whose courses to update
+            teacher (Dict[str, Any]): The teacher document (or its summary)
+
+        Returns:
+            int: Number of courses rewritten
+        """
+        summary = CourseService.teacher_summary(teacher)
+        result = course_collection.update_many(
+            {"teacherId": teacher_id, "teacher": {"$ne": summary}},
+            {"$set": {"teacher": summary}}
+        )
+        if result.modified_count:
+            course_ids = course_collection.find({"teacherId": teacher_id}, {"_id": 1})
+            course_cache.invalidate(*(course_key(course["_id"]) for course in course_ids))
+            VersionStamps.bump(COURSES_KEY)
+            logger.info("Updated teacher summary on %d courses of teacher %s", result.modified_count, teacher_id)
+        return result.modified_count
+
+    @staticmethod
+    def check_teacher_summaries(repair: bool = False) -> Dict[str, int]:
+        """Find courses whose teacher summary no longer matches teacherDirectory.
+
+        Drift can come from a fan-out that failed after the teacher was
+        updated, or from courses created before summaries existed. Courses
+        are grouped by teacher in one aggregation and the teachers are read
+        TEACHER_SUMMARY_BATCH_SIZE at a time.
+
+        Args:
+            repair (bool): Rewrite the summaries of drifted teachers' courses
+
+        Returns:
+            Dict[str, int]: Counts of 'teachers' checked, 'drifted' teachers,
+                'orphaned' teachers (courses whose teacher no longer exists)
+                and 'repaired' courses
+        """
+        counts = {"teachers": 0, "drifted": 0, "orphaned": 0, "repaired": 0}
+        groups = course_collection.aggregate([
+            # $ifNull so a course with no summary shows up as null rather
+            # than being skipped by $addToSet
+            {"$group": {"_id": "$teacherId", "summaries": {"$addToSet": {"$ifNull": ["$teacher", None]}}}}
+        ])
+
+        def check(batch):
+            summaries = CourseService.load_teacher_summaries(group["_id"] for group in batch)
+            for group in batch:
+                counts["teachers"] += 1
+                expected = summaries.get(group["_id"])
+                if expected is None:
+                    counts["orphaned"] += 1
+                    logger.warning("Courses reference missing teacher %s", group["_id"])
+                elif group["summaries"] != [expected]:
+                    counts["drifted"] += 1
+                    logger.warning("Teacher summary drift for teacher %s", group["_id"])
+                    if repair:
+                        counts["repaired"] += CourseService.update_teacher_summary(group["_id"], expected)
+
+        batch = []
+        for group in groups:
+            batch.append(group)
+            if len(batch) >= TEACHER_SUMMARY_BATCH_SIZE:
+                check(batch)
+                batch = []
+        if batch:
+            check(batch)
+        return counts
+
+    @staticmethod
+    def student_courses_pipeline(student_id: str) -> List[Dict[str, Any]]:
+        """Build the aggregation behind get_student_courses.
+
+        Raises:
+            ValueError: If student_id is not a valid ObjectId
+        """
+        try:
+            student_object_id = ObjectId(student_id)
+        except Exception:
+            raise ValueError(f"Invalid student ID format: {student_id}")
+
+        return [
+            {"$match": {"studentId": student_object_id, "status": "active"}},
+            {"$lookup": {
+                "from": course_collection.name,
+                "localField": "courseId",
+                "foreignField": "_id",
+                "as": "course"
+            }},
+            {"$unwind": "$course"},
+            {"$replaceRoot": {"newRoot": "$course"}}
+        ]
+
+    @staticmethod
+    def get_student_courses(student_id: str) -> List[Dict[str, Any]]:
+        """Get all active courses for a student, with each course's teacher.
+
+        Runs a single aggregation (enrollments -> courseCatalog) so the number
+        of round trips does not grow with the number of enrollments; each
+        course carries its teacher's name, so no teacher lookup is needed
+        (except for courses not yet backfilled, see fill_teacher_summaries).
+
+        Args:
+            student_id (str): The ID of the student
+
+        Returns:
+            List[Dict[str, Any]]: Course documents, each with a
+                'teacher' entry holding the teacher's firstName/lastName
+
+        Raises:
+            ValueError: If student_id is not a valid ObjectId
+
+        Example:
+            >>> courses = CourseService.get_student_courses("507f1f77bcf86cd799439011")
+        """
+        pipeline = CourseService.student_courses_pipeline(student_id)
+        courses = list(enrollment_collection.aggregate(pipeline))
+        return CourseService.fill_teacher_summaries(courses)
+
     @staticmethod
     def enroll_student_by_code(course_code, student_id):
         """Enroll a student using a course code."""
@@ -206,29 +676,228 @@ class CourseService:
             # Convert student_id to ObjectId
             student_id = ObjectId(student_id)
 
-            # Check if already enrolled
-            existing = enrollment_collection.find_one({
-                "courseId": course["_id"],
-                "studentId": student_id
-            })
-            if existing:
+            # Create the enrollment, or reactivate one the student was
+            # removed from; an active enrollment doesn't match the filter, so
+            # the upsert's insert is rejected by the unique (courseId,
+            # studentId) index
+            try:
+                enrollment_collection.update_one(
+                    {"courseId": course["_id"], "studentId": student_id, "status": {"$ne": "active"}},
+                    {"$set": {"status": "active", "enrollDate": datetime.utcnow()}},
+                    upsert=True
+                )
+            except DuplicateKeyError:
                 raise ValueError("Already enrolled in this course")
+            VersionStamps.bump(student_courses_key(student_id))
+            logger.debug("Enrolled student %s in course %s", student_id, course["_id"])
 
-            # Create enrollment
-            enrollment = {
-                "courseId": course["_id"],
-                "studentId": student_id,
-                "enrollDate": datetime.utcnow(),
-                "status": "active"
-            }
-            
-            print(f"Creating enrollment: {enrollment}")
-            result = enrollment_collection.insert_one(enrollment)
-            print(f"Enrollment created with ID: {result.inserted_id}")
+            return course
+        except ValueError as e:
+            logger.info("Enrollment rejected: %s", e)
+            raise
+        except Exception:
+            logger.exception("Error in enroll_student_by_code")
+            raise
 
-            return serialize_mongo_doc(course)
-        except Exception as e:
-            print(f"Error in enroll_student_by_code: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            raise 
\ No newline at end of file
+    @staticmethod
+    def import_roster(course_id: str, rows: Iterable[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        """Enroll a roster of students, identified by student ID or email.
+
+        Rows are consumed lazily in batches of ROSTER_BATCH_SIZE. Each batch
+        costs one lookup in studentDirectory and one unordered bulk_write;
+        students who are already enrolled are rejected by the unique
+        (courseId, studentId) index rather than a pre-read, and students who
+        were removed from the course are reactivated. Emails match regardless
+        of case.
+
+        Args:
+            course_id (str): The ID of the course
+            rows (Iterable[Tuple[int, str]]): (line number, student ID or email)
+
+        Returns:
+            List[Dict[str, Any]]: One entry per row with 'line', 'value' and a
+                'status' of enrolled, duplicate, not_found or error
+
+        Raises:
+            ValueError: If the course does not exist
+        """
+        try:
+            course_object_id = ObjectId(course_id)
+        except Exception:
+            raise ValueError(f"Invalid course ID format: {course_id}")
+        if not course_collection.find_one({"_id": course_object_id}, {"_id": 1}):
+            raise ValueError("Course not found")
+
+        report = []
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= ROSTER_BATCH_SIZE:
+                report.extend(CourseService._enroll_roster_batch(course_object_id, batch))
+                batch = []
+        if batch:
+            report.extend(CourseService._enroll_roster_batch(course_object_id, batch))
+        return report
+
+    @staticmethod
+    def _enroll_roster_batch(course_object_id: ObjectId, batch: List[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        ids = [ObjectId(value) for _, value in batch if ObjectId.is_valid(value)]
+        emails = list({value for _, value in batch if '@' in value})
+
+        # Emails match regardless of case, through the collated email_ci index
+        students_by_key = {}
+        for student in student_collection.find(
+            {"$or": [{"_id": {"$in": ids}}, {"email": {"$in": emails}}]},
+            {"_id": 1, "email": 1},
+            collation=EMAIL_COLLATION
+        ):
+            students_by_key[str(student["_id"])] = student["_id"]
+            if student.get("email"):
+                students_by_key[student["email"].lower()] = student["_id"]
+
+        report = []
+        operations = []
+        operation_rows = []  # bulk_write operation index -> report index
+        operation_students = []
+        now = datetime.utcnow()
+        for line, value in batch:
+            student_id = students_by_key.get(value.lower() if '@' in value else value)
+            if not student_id:
+                report.append({"line": line, "value": value, "status": "not_found"})
+                continue
+            operation_rows.append(len(report))
+            operation_students.append(student_id)
+            report.append({"line": line, "value": value, "status": "enrolled"})
+            operations.append(UpdateOne(
+                {"courseId": course_object_id, "studentId": student_id, "status": {"$ne": "active"}},
+                {"$set": {"status": "active", "enrollDate": now}},
+                upsert=True
+            ))
+
+        if operations:
+            try:
+                enrollment_collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get('writeErrors', []):
+                    entry = report[operation_rows[write_error['index']]]
+                    if write_error.get('code') == 11000:
+                        entry["status"] = "duplicate"
+                    else:
+                        entry["status"] = "error"
+                        entry["error"] = write_error.get('errmsg', 'Failed to enroll student')
+            VersionStamps.bump(*(student_courses_key(student_id) for student_id in operation_students))
+        return report
+
+    @staticmethod
+    def course_students_pipeline(
+        course_id: str,
+        limit: int,
+        after: Optional[List[Any]] = None,
+        name_prefix: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Build the aggregation behind get_course_students.
+
+        Reads the course's active enrollments in studentId order off the
+        (courseId, studentId) index and joins each to its student, stopping
+        once limit + 1 students have matched.
+
+        Raises:
+            ValueError: If course_id or the cursor is invalid
+        """
+        try:
+            course_object_id = ObjectId(course_id)
+        except Exception:
+            raise ValueError(f"Invalid course ID format: {course_id}")
+
+        match = {"courseId": course_object_id, "status": "active"}
+        if after:
+            if len(after) != 1 or not isinstance(after[0], ObjectId):
+                raise ValueError("Invalid cursor")
+            match["studentId"] = {"$gt": after[0]}
+
+        student_match = {"$expr": {"$eq": ["$_id", "$$studentId"]}}
+        if name_prefix:
+            prefix = {"$regex": f"^{re.escape(name_prefix)}", "$options": "i"}
+            student_match["$or"] = [{"firstName": prefix}, {"lastName": prefix}]
+
+        return [
+            {"$match": match},
+            {"$sort": {"studentId": 1}},
+            {"$lookup": {
+                "from": student_collection.name,
+                "let": {"studentId": "$studentId"},
+                "pipeline": [
+                    {"$match": student_match},
+                    {"$project": ROSTER_STUDENT_PROJECTION}
+                ],
+                "as": "student"
+            }},
+            {"$unwind": "$student"},
+            {"$limit": limit + 1},
+            {"$replaceRoot": {"newRoot": {"$mergeObjects": ["$student", {"enrollDate": "$enrollDate"}]}}}
+        ]
+
+    @staticmethod
+    def get_course_students(
+        course_id: str,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+        name_prefix: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of the students actively enrolled in a course.
+
+        Runs a single aggregation (enrollments -> studentDirectory), so a page
+        costs one round trip however large the roster is.
+
+        Args:
+            course_id (str): The ID of the course
+            limit (int): Maximum number of students to return
+            after (Optional[List[Any]]): Decoded cursor from the previous page
+            name_prefix (Optional[str]): Only return students whose first or
+                last name starts with this (case-insensitive)
+
+        Returns:
+            tuple: (students, next_cursor) where each student has _id,
+                firstName, lastName, email and enrollDate, and next_cursor is
+                None on the last page
+
+        Raises:
+            ValueError: If course_id or the cursor is invalid
+
+        Example:
+            >>> students, cursor = CourseService.get_course_students("507f1f77bcf86cd799439011", name_prefix="lov")
+        """
+        pipeline = CourseService.course_students_pipeline(course_id, limit, after, name_prefix)
+        students = list(enrollment_collection.aggregate(pipeline))
+        if len(students) <= limit:
+            return students, None
+        return students[:limit], encode_cursor([students[limit - 1]['_id']])
+
+    @staticmethod
+    def remove_student(course_id: str, student_id: str) -> None:
+        """Remove a student from a course.
+
+        The enrollment is kept and marked inactive (one update on the unique
+        (courseId, studentId) index); enrolling again reactivates it.
+
+        Args:
+            course_id (str): The ID of the course
+            student_id (str): The ID of the student
+
+        Raises:
+            ValueError: If either ID is invalid or the student is not actively
+                enrolled in the course
+        """
+        try:
+            course_object_id = ObjectId(course_id)
+            student_object_id = ObjectId(student_id)
+        except Exception:
+            raise ValueError("Invalid course or student ID format")
+
+        result = enrollment_collection.update_one(
+            {"courseId": course_object_id, "studentId": student_object_id, "status": "active"},
+            {"$set": {"status": "inactive", "removedAt": datetime.utcnow()}}
+        )
+        if result.matched_count == 0:
+            raise ValueError("Student is not enrolled in this course")
+        VersionStamps.bump(student_courses_key(student_object_id))
@@ -0,0 +1,194 @@
+from typing import Dict, Any, List, Optional, Tuple
+import re
+from bson import ObjectId
+from datetime import datetime
+from config.database import material_collection
+from services.version_stamps import VersionStamps, course_files_key
+from utils.helpers import encode_cursor
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Fields returned by catalog listings
+MATERIAL_PROJECTION = {"key": 1, "title": 1, "description": 1, "size": 1, "uploadedAt": 1}
+
+class MaterialService:
+    @staticmethod
+    def _course_object_id(course_id: str) -> ObjectId:
+        try:
+            return ObjectId(course_id)
+        except Exception:
+            raise ValueError(f"Invalid course ID format: {course_id}")
+
+    @staticmethod
+    def add_material(
+        course_id: str,
+        file_key: str,
+        title: str,
+        description: str = '',
+        size: int = 0,
+        uploaded_at: Optional[datetime] = None
+    ) -> None:
+        """Record an uploaded file in the materials catalog.
+
+        Upserts on the S3 key, so recording the same object twice (for example
+        from a reconcile run) is harmless.
+
+        Args:
+            course_id (str): The ID of the course the file belongs to
+            file_key (str): The S3 object key
+            title (str): Display title of the material
+            description (str): Optional description
+            size (int): Object size in bytes
+            uploaded_at (Optional[datetime]): Upload time, defaults to now
+
+        Example:
+            >>> MaterialService.add_material("507f1f77bcf86cd799439011",
+            ...     "courses/507f1f77bcf86cd799439011/20240101_120000_ab12cd34.pdf", "Week 1")
+        """
+        course_object_id = MaterialService._course_object_id(course_id)
+        material_collection.update_one(
+            {"key": file_key},
+            {"$set": {
+                "courseId": course_object_id,
+                "title": title,
+                "description": description,
+                "size": size,
+                "uploadedAt": uploaded_at or datetime.utcnow()
+            }},
+            upsert=True
+        )
+        VersionStamps.bump(course_files_key(course_object_id))
+
+    @staticmethod
+    def remove_material(file_key: str) -> None:
+        """Remove a file from the materials catalog."""
+        material = material_collection.find_one_and_delete({"key": file_key}, projection={"courseId": 1})
+        if material:
+            VersionStamps.bump(course_files_key(material["courseId"]))
+
+    @staticmethod
+    def list_course_files(
+        course_id: str,
+        s3_service,
+        limit: int = 100,
+        after: Optional[List[Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List one page of a course's files from the catalog.
+
+        One indexed query replaces the S3 listing plus a head_object per file.
+        Pages are keyed on the catalog _id, so they stay stable while files are
+        added or removed.
+
+        Args:
+            course_id (str): The ID of the course
+            s3_service (S3Service): Used to sign download URLs
+            limit (int): Maximum number of files to return
+            after (Optional[List[Any]]): Decoded cursor of the previous page
+
+        Returns:
+            tuple: (files, next_cursor)
+                - files: Files with key, title, description, url, size and lastModified
+                - next_cursor: Cursor for the next page, None on the last page
+
+        Raises:
+            ValueError: If course_id or the cursor is invalid
+        """
+        materials = list(
+            material_collection.find(MaterialService.files_query(course_id, after), MATERIAL_PROJECTION)
+            .sort("_id", 1)
+            .limit(limit + 1)
+        )
+        urls = [s3_service.generate_presigned_url(material['key']) for material in materials[:limit]]
+        return MaterialService.files_page(materials, urls, limit)
+
+    @staticmethod
+    def files_query(course_id: str, after: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Build the catalog query for a page of a course's files.
+
+        Raises:
+            ValueError: If course_id or the cursor is invalid
+        """
+        query = {"courseId": MaterialService._course_object_id(course_id)}
+        if after:
+            if not isinstance(after[0], ObjectId):
+                raise ValueError("Invalid cursor")
+            query["_id"] = {"$gt": after[0]}
+        return query
+
+    @staticmethod
+    def files_page(
+        materials: List[Dict[str, Any]],
+        urls: List[str],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Shape up to limit + 1 catalog documents into a page of files.
+
+        The extra document, when present, only signals that another page exists.
+        """
+        next_cursor = encode_cursor([materials[limit - 1]['_id']]) if len(materials) > limit else None
+        files = [
+            {
+                'key': material['key'],
+                'title': material['title'],
+                'description': material.get('description', ''),
+                'url': url,
+                'size': material.get('size', 0),
+                'lastModified': material['uploadedAt'].isoformat()
+            }
+            for material, url in zip(materials, urls)
+        ]
+        return files, next_cursor
+
+    @staticmethod
+    def reconcile(s3_service, course_id: Optional[str] = None, prune: bool = False) -> Dict[str, int]:
+        """Bring the catalog in line with the objects stored in S3.
+
+        Objects uploaded before the catalog existed are added using their S3
+        metadata; this costs one head_object per missing object, once.
+
+        Args:
+            s3_service (S3Service): Used to list objects and read their metadata
+            course_id (Optional[str]): Restrict to one course, all courses if None
+            prune (bool): Also delete catalog entries whose object is gone
+
+        Returns:
+            Dict[str, int]: Counts of 'scanned', 'added' and 'pruned' entries
+        """
+        prefix = f"courses/{course_id}/" if course_id else "courses/"
+        catalog_query = {"key": {"$regex": f"^{re.escape(prefix)}"}}
+        known_keys = {doc['key'] for doc in material_collection.find(catalog_query, {"key": 1})}
+
+        counts = {'scanned': 0, 'added': 0, 'pruned': 0}
+        seen_keys = set()
+        for obj in s3_service.iter_objects(prefix):
+            counts['scanned'] += 1
+            file_key = obj['Key']
+            seen_keys.add(file_key)
+            if file_key in known_keys:
+                continue
+
+            parts = file_key.split('/')
+            if len(parts) < 3 or not ObjectId.is_valid(parts[1]):
+                logger.warning("Skipping object outside a course directory: %s", file_key)
+                continue
+
+            metadata = s3_service.get_metadata(file_key)
+            MaterialService.add_material(
+                course_id=parts[1],
+                file_key=file_key,
+                title=metadata.get('title', parts[-1]),
+                size=obj['Size'],
+                uploaded_at=obj['LastModified']
+            )
+            counts['added'] += 1
+
+        if prune:
+            stale_keys = list(known_keys - seen_keys)
+            if stale_keys:
+                stale_courses = material_collection.distinct("courseId", {"key": {"$in": stale_keys}})
+                result = material_collection.delete_many({"key": {"$in": stale_keys}})
+                counts['pruned'] = result.deleted_count
+                VersionStamps.bump(*(course_files_key(course) for course in stale_courses))
+
+        return counts
@@ -1,21 +1,100 @@
-import boto3
 from botocore.exceptions import ClientError
 import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 import uuid
+from utils.cache import TTLCache
+from utils.log import get_logger
+from utils.metrics import instrument_s3_client
+
+logger = get_logger(__name__)
+
+# Presigned URLs are reused until they are this close to expiring, which keeps
+# download URLs stable across page loads so browsers and CDNs can cache them
+PRESIGNED_URL_CACHE_SIZE = int(os.getenv('PRESIGNED_URL_CACHE_SIZE', '10000'))
+PRESIGNED_URL_REFRESH_MARGIN = int(os.getenv('PRESIGNED_URL_REFRESH_MARGIN', '300'))
+
+# Uploads larger than the threshold are sent as a multipart upload, reading one
+# part at a time from the source file. Memory per upload is bounded by roughly
+# part size * concurrency.
+S3_MULTIPART_THRESHOLD = int(os.getenv('S3_MULTIPART_THRESHOLD', str(8 * 1024 * 1024)))
+S3_MULTIPART_PART_SIZE = int(os.getenv('S3_MULTIPART_PART_SIZE', str(8 * 1024 * 1024)))
+S3_MULTIPART_CONCURRENCY = int(os.getenv('S3_MULTIPART_CONCURRENCY', '4'))
+
+# Largest file a browser may upload directly with a presigned POST
+DIRECT_UPLOAD_MAX_BYTES = int(os.getenv('DIRECT_UPLOAD_MAX_BYTES', str(500 * 1024 * 1024)))
+
+def presign_window() -> int:
+    """Index of the current PRESIGNED_URL_REFRESH_MARGIN-long time window.
+
+    A cached presigned URL is reused until PRESIGNED_URL_REFRESH_MARGIN
+    seconds before it expires. Responses holding such URLs put this in their
+    ETag, so a 304 never extends a stored copy past the URLs' expiry.
+    """
+    return int(time.time() // PRESIGNED_URL_REFRESH_MARGIN)
 
 class S3Service:
+    """Course file storage in S3.
+
+    boto3 is imported and the client built on first use, not in __init__, so
+    creating the service at route import time is cheap; warm_up() builds it
+    ahead of the first request. Like the Mongo client, the boto3 client is
+    per process and is rebuilt after a fork.
+    """
+
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
         self.bucket_name = os.getenv('AWS_BUCKET_NAME')
+        self.url_cache = TTLCache(maxsize=PRESIGNED_URL_CACHE_SIZE)
+        self._client = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+        self._transfer_config = None
+
+    @property
+    def s3_client(self):
+        """This process's boto3 S3 client, created on first use."""
+        if self._client_pid != os.getpid():
+            with self._client_lock:
+                if self._client_pid != os.getpid():
+                    import boto3
+                    client = boto3.client(
+                        's3',
+                        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                        region_name=os.getenv('AWS_REGION')
+                    )
+                    instrument_s3_client(client)
+                    self._client = client
+                    self._client_pid = os.getpid()
+        return self._client
+
+    @property
+    def transfer_config(self):
+        """Multipart settings for upload_file."""
+        if self._transfer_config is None:
+            from boto3.s3.transfer import TransferConfig
+            self._transfer_config = TransferConfig(
+                multipart_threshold=S3_MULTIPART_THRESHOLD,
+                multipart_chunksize=S3_MULTIPART_PART_SIZE,
+                max_concurrency=S3_MULTIPART_CONCURRENCY
+            )
+        return self._transfer_config
+
+    def warm_up(self):
+        """Import boto3 and build the client now rather than in the first request."""
+        return self.s3_client
 
     def generate_presigned_url(self, file_key, expiration=3600):
-        """Generate a presigned URL for downloading a file."""
+        """Generate a presigned URL for downloading a file.
+
+        URLs are cached per key and re-signed only once they are within
+        PRESIGNED_URL_REFRESH_MARGIN seconds of expiring.
+        """
+        cached = self.url_cache.get(file_key)
+        if cached and cached[0] == expiration:
+            return cached[1]
+
         try:
             url = self.s3_client.generate_presigned_url(
                 'get_object',
@@ -25,76 +104,143 @@ class S3Service:
                 },
                 ExpiresIn=expiration
             )
+            reuse_for = expiration - PRESIGNED_URL_REFRESH_MARGIN
+            if reuse_for > 0:
+                self.url_cache.set(file_key, (expiration, url), ttl=reuse_for)
             return url
         except ClientError as e:
-            print(f"Error generating presigned URL: {e}")
+            logger.error("Error generating presigned URL for %s: %s", file_key, e)
             return None
 
+    @staticmethod
+    def new_file_key(course_id):
+        """Build a unique object key under the course directory."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        unique_id = str(uuid.uuid4())[:8]
+        file_extension = 'pdf'  # Since we're only handling PDFs
+        return f"courses/{course_id}/{timestamp}_{unique_id}.{file_extension}"
+
+    def generate_upload_post(self, course_id, title, expiration=900):
+        """Generate a presigned POST for uploading a PDF straight from the browser.
+
+        The policy pins the object key, content type and title metadata, and
+        limits the size to DIRECT_UPLOAD_MAX_BYTES, so the browser can only
+        write the one object it was issued.
+
+        Returns:
+            dict: 'url' and 'fields' for the form POST, and the reserved 'fileKey'
+        """
+        file_key = self.new_file_key(course_id)
+        fields = {
+            'Content-Type': 'application/pdf',
+            'x-amz-meta-title': title,
+            'x-amz-meta-original_filename': title
+        }
+        conditions = [
+            {'Content-Type': 'application/pdf'},
+            {'x-amz-meta-title': title},
+            {'x-amz-meta-original_filename': title},
+            ['content-length-range', 1, DIRECT_UPLOAD_MAX_BYTES]
+        ]
+        post = self.s3_client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=file_key,
+            Fields=fields,
+            Conditions=conditions,
+            ExpiresIn=expiration
+        )
+        return {'url': post['url'], 'fields': post['fields'], 'fileKey': file_key}
+
+    def get_object_info(self, file_key):
+        """Return size, content type, metadata and modification time of an object.
+
+        Returns:
+            dict: Object details, or None if the object does not exist
+        """
+        try:
+            response = self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=file_key
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+        return {
+            'size': response['ContentLength'],
+            'contentType': response.get('ContentType'),
+            'metadata': response.get('Metadata', {}),
+            'lastModified': response['LastModified']
+        }
+
     def upload_file(self, file_data, original_filename, course_id):
-        """Upload a file to S3 and return the file key."""
+        """Upload a file to S3 and return the file key.
+
+        file_data is a readable file object; it is streamed to S3 part by part
+        rather than read into memory. If any part fails, the multipart upload is
+        aborted so no incomplete parts are left behind.
+        """
         try:
             # Generate unique filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            unique_id = str(uuid.uuid4())[:8]
-            # Get extension from the actual file name, not the title
-            file_extension = 'pdf'  # Since we're only handling PDFs
-            file_key = f"courses/{course_id}/{timestamp}_{unique_id}.{file_extension}"
+            file_key = self.new_file_key(course_id)
 
             # Upload file
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=file_data,
-                ContentType='application/pdf',
-                Metadata={
-                    'title': original_filename,  # This is actually the title from the form
-                    'original_filename': original_filename
-                }
+            self.s3_client.upload_fileobj(
+                file_data,
+                self.bucket_name,
+                file_key,
+                ExtraArgs={
+                    'ContentType': 'application/pdf',
+                    'Metadata': {
+                        'title': original_filename,  # This is actually the title from the form
+                        'original_filename': original_filename
+                    }
+                },
+                Config=self.transfer_config
             )
 
             return file_key
-        except Exception as e:
-            print(f"Error uploading file: {e}")
+        except Exception:
+            logger.exception("Error uploading file")
             raise
 
-    def list_course_files(self, course_id):
-        """List all files in a course directory."""
-        try:
-            # List objects with course prefix
-            prefix = f"courses/{course_id}/"
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
+    def abort_incomplete_uploads(self, prefix="courses/", older_than=timedelta(hours=24)):
+        """Abort multipart uploads that were never completed.
 
-            files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Get object metadata
-                    metadata = self.s3_client.head_object(
+        Failed uploads are aborted as they fail; this cleans up after workers
+        that died mid-upload, whose parts would otherwise be billed forever.
+
+        Returns:
+            int: Number of uploads aborted
+        """
+        cutoff = datetime.now(timezone.utc) - older_than
+        aborted = 0
+        paginator = self.s3_client.get_paginator('list_multipart_uploads')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for upload in page.get('Uploads', []):
+                if upload['Initiated'] < cutoff:
+                    self.s3_client.abort_multipart_upload(
                         Bucket=self.bucket_name,
-                        Key=obj['Key']
+                        Key=upload['Key'],
+                        UploadId=upload['UploadId']
                     )
-                    
-                    # Generate a presigned URL for each file
-                    file_key = obj['Key']
-                    url = self.generate_presigned_url(file_key)
-                    
-                    # Get title from metadata or fallback to filename
-                    title = metadata.get('Metadata', {}).get('title', file_key.split('/')[-1])
-                    
-                    files.append({
-                        'key': file_key,
-                        'title': title,
-                        'url': url,
-                        'size': obj['Size'],
-                        'lastModified': obj['LastModified'].isoformat()
-                    })
-
-            return files
-        except Exception as e:
-            print(f"Error listing files: {e}")
-            raise
+                    aborted += 1
+        return aborted
+
+    def iter_objects(self, prefix):
+        """Yield every object under a prefix, following continuation tokens."""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield obj
+
+    def get_metadata(self, file_key):
+        """Return the user metadata stored on an object."""
+        response = self.s3_client.head_object(
+            Bucket=self.bucket_name,
+            Key=file_key
+        )
+        return response.get('Metadata', {})
 
     def delete_file(self, file_key):
         """Delete a file from S3."""
@@ -103,7 +249,8 @@ class S3Service:
                 Bucket=self.bucket_name,
                 Key=file_key
             )
+            self.url_cache.pop(file_key)
             return True
-        except Exception as e:
-            print(f"Error deleting file: {e}")
+        except Exception:
+            logger.exception("Error deleting file %s", file_key)
             raise 
\ No newline at end of file
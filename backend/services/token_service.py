@@ -0,0 +1,115 @@
+from typing import Dict, Any, Optional
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from flask import Flask
+from utils.cache import TTLCache
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Signing key for session tokens; every worker must share the same value
+SESSION_SECRET_KEY = os.getenv('SESSION_SECRET_KEY')
+SESSION_TOKEN_TTL = int(os.getenv('SESSION_TOKEN_TTL', str(12 * 3600)))
+SESSION_TOKEN_CACHE_SIZE = int(os.getenv('SESSION_TOKEN_CACHE_SIZE', '10000'))
+
+_secret = SESSION_SECRET_KEY.encode('utf-8') if SESSION_SECRET_KEY else None
+
+def init_session_secret(app: Flask) -> None:
+    """Check the signing key when the app is created.
+
+    A missing SESSION_SECRET_KEY stops the app unless it runs in debug or
+    testing mode, where a random per-process key is used instead: such a key
+    differs per worker and per restart, so tokens would not verify across
+    workers and every restart would log everyone out.
+
+    Raises:
+        RuntimeError: If SESSION_SECRET_KEY is not set outside debug/testing
+    """
+    global _secret
+    if _secret is not None:
+        return
+    if not (app.debug or app.testing):
+        raise RuntimeError("SESSION_SECRET_KEY is not set; set it, or run in debug mode for a random development key")
+    logger.warning("SESSION_SECRET_KEY is not set; using a random key, sessions will not survive a restart")
+    _secret = secrets.token_hex(32).encode('utf-8')
+
+def _signing_key() -> bytes:
+    if _secret is None:
+        raise RuntimeError("SESSION_SECRET_KEY is not set")
+    return _secret
+
+# Token digest -> verified claims, kept until the token expires
+_verified_tokens = TTLCache(maxsize=SESSION_TOKEN_CACHE_SIZE)
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+class TokenService:
+    @staticmethod
+    def issue(user_id: str, role: str, ttl: int = SESSION_TOKEN_TTL) -> Dict[str, Any]:
+        """Issue a signed session token.
+
+        Tokens are "<payload>.<signature>", both base64url encoded, where the
+        payload carries the user ID, role and expiry and the signature is an
+        HMAC-SHA256 of the payload.
+
+        Args:
+            user_id (str): The ID of the authenticated user
+            role (str): The user's role ('teacher' or 'student')
+            ttl (int): Token lifetime in seconds
+
+        Returns:
+            Dict[str, Any]: 'token' and its 'expiresAt' (Unix time)
+
+        Example:
+            >>> session = TokenService.issue("507f1f77bcf86cd799439011", "teacher")
+        """
+        now = int(time.time())
+        claims = {"sub": user_id, "role": role, "iat": now, "exp": now + ttl}
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))
+        signature = _b64encode(hmac.new(_signing_key(), payload.encode('ascii'), hashlib.sha256).digest())
+        return {"token": f"{payload}.{signature}", "expiresAt": claims["exp"]}
+
+    @staticmethod
+    def verify(token: str) -> Optional[Dict[str, Any]]:
+        """Verify a session token and return its claims.
+
+        Verified tokens are remembered by digest until they expire, so repeat
+        requests with the same token skip the HMAC and JSON decode.
+
+        Args:
+            token (str): Token as issued by TokenService.issue
+
+        Returns:
+            Optional[Dict[str, Any]]: Claims (sub, role, iat, exp), or None if
+                the token is malformed, forged or expired
+        """
+        digest = hashlib.sha256(token.encode('utf-8')).digest()
+        claims = _verified_tokens.get(digest)
+        if claims:
+            return claims
+
+        key = _signing_key()
+        try:
+            payload, signature = token.split('.')
+            expected = hmac.new(key, payload.encode('ascii'), hashlib.sha256).digest()
+            if not hmac.compare_digest(_b64decode(signature), expected):
+                return None
+            claims = json.loads(_b64decode(payload))
+        except Exception:
+            return None
+
+        remaining = claims.get("exp", 0) - time.time()
+        if remaining <= 0:
+            return None
+
+        _verified_tokens.set(digest, claims, ttl=remaining)
+        return claims
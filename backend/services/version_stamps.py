@@ -0,0 +1,95 @@
+"""Version stamps for conditional GETs on the dashboard listings.
+
+Each listing is versioned by a few counters in the versionStamps collection,
+and every write path that changes what a listing returns bumps its counter
+after the write. Routes read the counters (one `_id` lookup) before the
+listing query and derive a strong ETag from them, so a matching
+If-None-Match is answered with 304 before the query or any S3 call runs.
+
+    teacher:<id>   A teacher's course cards: course created, edited or re-coded
+    student:<id>   A student's enrollments: enrolled, removed, roster import
+    files:<id>     A course's files: uploaded, deleted or reconciled
+    courses        Any course's content, including its teacher's name. The
+                   student listing embeds full courses, and bumping every
+                   enrolled student on a course edit would be a fan-out,
+                   so course edits (rare) revalidate all student listings.
+
+A missing counter reads as 0. Counters are bumped after the write they
+describe, and a route reads them before its data, so a response can carry an
+older ETag than its content but never a newer one.
+
+A bump that fails after a successful write is logged, not raised: failing
+the request would invite the client to repeat a write that already happened.
+The unchanged counter would keep matching the client's ETag, so ETags also
+carry stamp_window(): every listing is re-sent at least once per
+VERSION_STAMP_WINDOW seconds, which bounds how long a lost bump can serve
+stale data.
+
+Environment Variables:
+    VERSION_STAMP_WINDOW (int): Longest time, in seconds, a listing can be
+        answered with 304 after a lost bump, defaults to 300
+"""
+
+from typing import List
+import os
+import time
+from pymongo import UpdateOne
+from config.database import version_collection
+from config.async_database import get_async_db
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+COURSES_KEY = 'courses'
+
+VERSION_STAMP_WINDOW = int(os.getenv('VERSION_STAMP_WINDOW', '300'))
+
+def stamp_window() -> int:
+    """Index of the current VERSION_STAMP_WINDOW-long time window, for ETags."""
+    return int(time.time() // VERSION_STAMP_WINDOW)
+
+def teacher_courses_key(teacher_id) -> str:
+    return f"teacher:{teacher_id}"
+
+def student_courses_key(student_id) -> str:
+    return f"student:{student_id}"
+
+def course_files_key(course_id) -> str:
+    return f"files:{course_id}"
+
+class VersionStamps:
+    @staticmethod
+    def bump(*keys: str) -> None:
+        """Increment counters, creating them as needed.
+
+        A failed bump is logged rather than raised, because the write it
+        follows has already succeeded. Clients can then get 304s with stale
+        data until the key is bumped again or the stamp_window() advances,
+        which happens at the latest after VERSION_STAMP_WINDOW seconds.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+        try:
+            if len(keys) == 1:
+                version_collection.update_one({"_id": keys[0]}, {"$inc": {"v": 1}}, upsert=True)
+            else:
+                version_collection.bulk_write(
+                    [UpdateOne({"_id": key}, {"$inc": {"v": 1}}, upsert=True) for key in keys],
+                    ordered=False
+                )
+        except Exception:
+            logger.exception("Failed to bump version stamps %s", keys)
+
+    @staticmethod
+    def get(keys: List[str]) -> List[int]:
+        """Read counters in one query, in the order of `keys`."""
+        found = {doc["_id"]: doc["v"] for doc in version_collection.find({"_id": {"$in": keys}})}
+        return [found.get(key, 0) for key in keys]
+
+    @staticmethod
+    async def get_async(keys: List[str]) -> List[int]:
+        """Async version of get, for the async I/O mode views."""
+        docs = await get_async_db()[version_collection.name].find({"_id": {"$in": keys}}).to_list(length=None)
+        found = {doc["_id"]: doc["v"] for doc in docs}
+        return [found.get(key, 0) for key in keys]
@@ -0,0 +1,54 @@
+import json
+import os
+from unittest import mock
+
+from bson import ObjectId
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+os.environ.setdefault('SESSION_SECRET_KEY', 'test-session-secret')
+os.environ['DB_INIT_ON_STARTUP'] = '0'
+os.environ['APP_WARMUP'] = '0'
+
+from app import create_app
+from routes.courses import BULK_COURSES_MAX_ROWS
+
+TEACHER = {'_id': str(ObjectId()), 'role': 'teacher'}
+AUTH = {'Authorization': 'Bearer token'}
+
+
+def post_bulk(body, content_type, headers=None):
+    client = create_app().test_client()
+    with mock.patch('routes.courses.authenticate_request', return_value=TEACHER), \
+            mock.patch('routes.courses.CourseService.create_courses_bulk', return_value=[]) as create:
+        response = client.post('/api/courses/bulk', data=body, content_type=content_type, headers={**AUTH, **(headers or {})})
+    return response, create
+
+
+def test_ndjson_stops_parsing_past_the_row_limit():
+    row = json.dumps({'courseName': 'Intro'}) + '\n'
+    with mock.patch('routes.courses.json.loads', wraps=json.loads) as loads:
+        response, create = post_bulk(row * (BULK_COURSES_MAX_ROWS * 10), 'application/x-ndjson')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f"At most {BULK_COURSES_MAX_ROWS} courses per request"
+    assert not create.called
+    # Rejected at row BULK_COURSES_MAX_ROWS + 1, not at the end of the body
+    assert loads.call_count == BULK_COURSES_MAX_ROWS
+
+
+def test_oversized_json_body_is_rejected_before_parsing():
+    with mock.patch('routes.courses.BULK_COURSES_MAX_BYTES', 100), \
+            mock.patch('routes.courses.json.loads') as loads:
+        response, create = post_bulk(json.dumps([{'courseName': 'x' * 200}]), 'application/json')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Request body is over 100 bytes"
+    assert not loads.called
+    assert not create.called
+
+
+def test_json_array_within_limits_is_created():
+    response, create = post_bulk(json.dumps([{'courseName': 'Intro'}]), 'application/json')
+
+    assert response.status_code == 200
+    create.assert_called_once_with([{'courseName': 'Intro'}], teacher_id=TEACHER['_id'])
@@ -0,0 +1,27 @@
+from unittest import mock
+
+from utils.cache import TTLCache
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_entries_expire_and_count_misses():
+    cache = TTLCache(maxsize=10, ttl=60)
+    with mock.patch('utils.cache.time.monotonic', return_value=1000):
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=5)
+    with mock.patch('utils.cache.time.monotonic', return_value=1010):
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+
+    assert (cache.hits, cache.misses) == (1, 1)
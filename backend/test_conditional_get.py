@@ -0,0 +1,53 @@
+import os
+from unittest import mock
+
+from bson import ObjectId
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+os.environ.setdefault('SESSION_SECRET_KEY', 'test-session-secret')
+os.environ['DB_INIT_ON_STARTUP'] = '0'
+os.environ['APP_WARMUP'] = '0'
+
+from app import create_app
+
+
+def test_student_courses_revalidate_on_version_stamps():
+    client = create_app().test_client()
+    url = f'/api/courses/student/{ObjectId()}'
+
+    with mock.patch('routes.courses.VersionStamps.get', return_value=[3, 7]) as stamps, \
+            mock.patch('routes.courses.CourseService.get_student_courses', return_value=[]) as courses:
+        first = client.get(url)
+        etag = first.headers['ETag']
+        cached = client.get(url, headers={'If-None-Match': etag})
+
+        stamps.return_value = [4, 7]
+        changed = client.get(url, headers={'If-None-Match': etag})
+
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    # The 304 is answered from the stamps alone
+    assert courses.call_count == 2
+
+
+def test_etag_changes_when_the_stamp_window_advances():
+    # A lost bump leaves the counters unchanged; the window still bounds the 304s
+    client = create_app().test_client()
+    url = f'/api/courses/student/{ObjectId()}'
+
+    with mock.patch('routes.courses.VersionStamps.get', return_value=[3, 7]), \
+            mock.patch('routes.courses.CourseService.get_student_courses', return_value=[]), \
+            mock.patch('routes.courses.stamp_window', return_value=100) as window:
+        etag = client.get(url).headers['ETag']
+        cached = client.get(url, headers={'If-None-Match': etag})
+
+        window.return_value = 101
+        expired = client.get(url, headers={'If-None-Match': etag})
+
+    assert cached.status_code == 304
+    assert expired.status_code == 200
+    assert expired.headers['ETag'] != etag
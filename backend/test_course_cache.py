@@ -0,0 +1,89 @@
+import os
+from unittest import mock
+
+from bson import ObjectId
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+
+from services.course_cache import CourseCache
+from services.course_service import CourseService
+
+
+def test_warm_course_detail_makes_no_database_calls():
+    cache = CourseCache(maxsize=10, ttl=60)
+    teacher_id = ObjectId()
+    course = {
+        '_id': ObjectId(), 'courseName': 'Intro to Programming', 'teacherId': teacher_id,
+        'teacher': {'firstName': 'Ada', 'lastName': 'Lovelace'}
+    }
+    courses = mock.Mock()
+    courses.find_one.return_value = dict(course)
+    teachers = mock.Mock()
+
+    with mock.patch('services.course_service.course_cache', cache), \
+            mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.teacher_collection', teachers):
+        first = CourseService.get_course_with_teacher(str(course['_id']))
+        second = CourseService.get_course_with_teacher(str(course['_id']))
+
+    assert first == second
+    assert second['teacher'] == {'firstName': 'Ada', 'lastName': 'Lovelace'}
+    assert courses.find_one.call_count == 1
+    assert not teachers.mock_calls
+    assert cache.stats()['hits'] == 1
+
+
+def test_writes_invalidate_cached_course():
+    cache = CourseCache(maxsize=10, ttl=60)
+    course_id = ObjectId()
+    courses = mock.Mock()
+    courses.find_one.return_value = {'_id': course_id, 'term': 'Fall'}
+    courses.find_one_and_update.return_value = {'_id': course_id, 'term': 'Spring'}
+
+    with mock.patch('services.course_service.course_cache', cache), \
+            mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.VersionStamps') as stamps:
+        assert CourseService.get_course(str(course_id))['term'] == 'Fall'
+        CourseService.update_course(str(course_id), {'term': 'Spring', 'teacherId': 'ignored'})
+        courses.find_one.return_value = {'_id': course_id, 'term': 'Spring'}
+        assert CourseService.get_course(str(course_id))['term'] == 'Spring'
+
+    assert courses.find_one.call_count == 2
+    assert courses.find_one_and_update.call_args[0][1] == {'$set': {'term': 'Spring'}}
+    stamps.bump.assert_called_once()
+
+
+def test_write_reaches_other_workers_within_local_ttl():
+    # Two workers without a shared layer: each has its own in-process cache
+    worker_a = CourseCache(maxsize=10, ttl=300, local_ttl=5)
+    worker_b = CourseCache(maxsize=10, ttl=300, local_ttl=5)
+    course_id = ObjectId()
+    courses = mock.Mock()
+    courses.find_one.return_value = {'_id': course_id, 'term': 'Fall', 'courseCode': 'OLD123'}
+    courses.find_one_and_update.return_value = {'_id': course_id, 'term': 'Spring'}
+    clock = [1000.0]
+
+    def read(worker):
+        with mock.patch('services.course_service.course_cache', worker):
+            return CourseService.get_course(str(course_id))['term']
+
+    with mock.patch('utils.cache.time.monotonic', lambda: clock[0]), \
+            mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.VersionStamps'):
+        assert read(worker_a) == 'Fall'
+        assert read(worker_b) == 'Fall'
+
+        with mock.patch('services.course_service.course_cache', worker_a):
+            CourseService.update_course(str(course_id), {'term': 'Spring'})
+        courses.find_one.return_value = {'_id': course_id, 'term': 'Spring', 'courseCode': 'NEW456'}
+
+        assert read(worker_a) == 'Spring'
+        # Worker B's copy may be stale, but only until its local TTL runs out
+        assert read(worker_b) == 'Fall'
+        clock[0] += 5
+        assert read(worker_b) == 'Spring'
+
+        # The course code is always read from the database
+        with mock.patch('services.course_service.course_cache', worker_b):
+            worker_b.set(f"course:{course_id}", {'_id': course_id, 'courseCode': 'OLD123'})
+            assert CourseService.get_course_code(str(course_id))['courseCode'] == 'NEW456'
@@ -0,0 +1,253 @@
+import os
+from unittest import mock
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+
+from services.course_service import CourseService
+from utils.helpers import decode_cursor
+
+
+class CountingCollection:
+    """Stand-in collection that records every call made against it."""
+
+    def __init__(self, name, results=None, errors=None):
+        self.name = name
+        self.results = results or []
+        self.errors = errors or {}  # method -> exception raised by every call
+        self.calls = []
+        self.arguments = []
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self.calls.append(method)
+            self.arguments.append((args, kwargs))
+            if method in self.errors:
+                raise self.errors[method]
+            return iter(self.results)
+        return call
+
+
+def make_course(teacher_id):
+    return {
+        '_id': ObjectId(),
+        'courseName': 'Intro to Programming',
+        'teacherId': teacher_id,
+        'teacher': {'firstName': 'Ada', 'lastName': 'Lovelace'}
+    }
+
+
+@pytest.mark.parametrize('enrollment_count', [0, 1, 8, 50])
+def test_get_student_courses_uses_fixed_query_count(enrollment_count):
+    teacher_id = ObjectId()
+    enrollments = CountingCollection('enrollments', [make_course(teacher_id) for _ in range(enrollment_count)])
+    courses = CountingCollection('courseCatalog')
+    teachers = CountingCollection('teacherDirectory')
+
+    with mock.patch('services.course_service.enrollment_collection', enrollments), \
+            mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.teacher_collection', teachers):
+        result = CourseService.get_student_courses(str(ObjectId()))
+
+    assert enrollments.calls == ['aggregate']
+    assert courses.calls == []
+    assert teachers.calls == []
+    assert len(result) == enrollment_count
+    for course in result:
+        assert course['teacherId'] == teacher_id
+        assert course['teacher'] == {'firstName': 'Ada', 'lastName': 'Lovelace'}
+
+
+def test_get_student_courses_rejects_invalid_id():
+    with pytest.raises(ValueError):
+        CourseService.get_student_courses('not-an-object-id')
+
+
+def test_insert_course_with_code_retries_on_code_collision():
+    collision = DuplicateKeyError('duplicate', 11000, {'keyPattern': {'courseCode': 1}})
+    courses = mock.Mock()
+    courses.insert_one.side_effect = [collision, mock.Mock(inserted_id=ObjectId())]
+
+    with mock.patch('services.course_service.course_collection', courses):
+        CourseService.insert_course_with_code({'courseName': 'Intro'})
+
+    assert courses.insert_one.call_count == 2
+    assert courses.find_one.call_count == 0
+
+
+def test_teacher_courses_page_cursor_resumes_after_last_course():
+    teacher_id = ObjectId()
+    courses = [{'_id': ObjectId(), 'year': '2024', 'term': term} for term in ('Spring', 'Fall', 'Fall')]
+
+    page, cursor = CourseService.teacher_courses_page(courses, 2)
+    query = CourseService.teacher_courses_query(teacher_id, decode_cursor(cursor), term='Fall')
+
+    assert page == courses[:2]
+    assert query['teacherId'] == teacher_id
+    assert query['term'] == 'Fall'
+    assert query['$or'][2] == {'year': '2024', 'term': 'Fall', '_id': {'$lt': courses[1]['_id']}}
+    assert CourseService.teacher_courses_page(courses, 3) == (courses, None)
+
+
+def test_teacher_courses_query_rejects_foreign_cursor():
+    with pytest.raises(ValueError):
+        CourseService.teacher_courses_query(ObjectId(), [ObjectId()])
+
+
+def test_course_students_pipeline_joins_before_limiting():
+    pipeline = CourseService.course_students_pipeline(str(ObjectId()), 50, name_prefix='o.b')
+    stages = [next(iter(stage)) for stage in pipeline]
+
+    assert stages == ['$match', '$sort', '$lookup', '$unwind', '$limit', '$replaceRoot']
+    assert pipeline[4] == {'$limit': 51}
+    student_match = pipeline[2]['$lookup']['pipeline'][0]['$match']
+    assert student_match['$or'][0] == {'firstName': {'$regex': r'^o\.b', '$options': 'i'}}
+
+
+def test_remove_student_marks_enrollment_inactive():
+    enrollments = mock.Mock()
+    enrollments.update_one.return_value = mock.Mock(matched_count=0)
+
+    with mock.patch('services.course_service.enrollment_collection', enrollments):
+        with pytest.raises(ValueError):
+            CourseService.remove_student(str(ObjectId()), str(ObjectId()))
+
+    query, update = enrollments.update_one.call_args[0]
+    assert query['status'] == 'active'
+    assert update['$set']['status'] == 'inactive'
+
+
+def test_check_teacher_summaries_repairs_drifted_teachers():
+    current, renamed, missing = ObjectId(), ObjectId(), ObjectId()
+    courses = mock.Mock()
+    courses.aggregate.return_value = iter([
+        {'_id': current, 'summaries': [{'firstName': 'Ada', 'lastName': 'Lovelace'}]},
+        {'_id': renamed, 'summaries': [{'firstName': 'Grace', 'lastName': 'Murray'}]},
+        {'_id': missing, 'summaries': []}
+    ])
+    courses.update_many.return_value = mock.Mock(modified_count=4)
+    courses.find.return_value = iter([])
+    teachers = mock.Mock()
+    teachers.find.return_value = iter([
+        {'_id': current, 'firstName': 'Ada', 'lastName': 'Lovelace'},
+        {'_id': renamed, 'firstName': 'Grace', 'lastName': 'Hopper'}
+    ])
+
+    with mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.teacher_collection', teachers), \
+            mock.patch('services.course_service.VersionStamps'):
+        counts = CourseService.check_teacher_summaries(repair=True)
+
+    assert counts == {'teachers': 3, 'drifted': 1, 'orphaned': 1, 'repaired': 4}
+    assert teachers.find.call_count == 1
+    query, update = courses.update_many.call_args[0]
+    summary = {'firstName': 'Grace', 'lastName': 'Hopper'}
+    assert query == {'teacherId': renamed, 'teacher': {'$ne': summary}}
+    assert update == {'$set': {'teacher': summary}}
+
+
+def test_create_courses_bulk_only_creates_for_the_given_teacher():
+    teacher_id, other_id = str(ObjectId()), str(ObjectId())
+    course = {'courseName': 'Intro', 'department': 'CS', 'courseNumber': '101',
+              'term': 'Fall', 'year': '2024', 'institution': 'University'}
+    courses = mock.Mock()
+    courses.insert_many.side_effect = lambda docs, ordered: [doc.setdefault('_id', ObjectId()) for doc in docs]
+    summaries = {ObjectId(teacher_id): {'firstName': 'Ada', 'lastName': 'Lovelace'}}
+
+    with mock.patch('services.course_service.course_collection', courses), \
+            mock.patch.object(CourseService, 'load_teacher_summaries', return_value=summaries), \
+            mock.patch('services.course_service.VersionStamps'):
+        results = CourseService.create_courses_bulk(
+            [dict(course), dict(course, teacherId=teacher_id), dict(course, teacherId=other_id)],
+            teacher_id=teacher_id
+        )
+
+    assert 'courseId' in results[0] and 'courseId' in results[1]
+    assert results[2]['error'] == "Courses can only be created for the authenticated teacher"
+    inserted = courses.insert_many.call_args[0][0]
+    assert [doc['teacherId'] for doc in inserted] == [ObjectId(teacher_id)] * 2
+
+
+def test_courses_without_teacher_summary_are_filled_in_one_query():
+    teacher_id = ObjectId()
+    legacy = [{'_id': ObjectId(), 'courseName': 'Old', 'teacherId': teacher_id} for _ in range(3)]
+    enrollments = mock.Mock()
+    enrollments.aggregate.return_value = iter(legacy + [make_course(ObjectId())])
+    teachers = mock.Mock()
+    teachers.find.return_value = iter([{'_id': teacher_id, 'firstName': 'Grace', 'lastName': 'Hopper'}])
+
+    with mock.patch('services.course_service.enrollment_collection', enrollments), \
+            mock.patch('services.course_service.teacher_collection', teachers):
+        result = CourseService.get_student_courses(str(ObjectId()))
+
+    assert teachers.find.call_count == 1
+    assert teachers.find.call_args[0][0] == {'_id': {'$in': [teacher_id]}}
+    assert [course['teacher'] for course in result[:3]] == [{'firstName': 'Grace', 'lastName': 'Hopper'}] * 3
+    assert result[3]['teacher'] == {'firstName': 'Ada', 'lastName': 'Lovelace'}
+
+
+def test_create_course_for_unknown_teacher_is_a_validation_error():
+    course = {'courseName': 'Intro', 'department': 'CS', 'courseNumber': '101', 'term': 'Fall',
+              'year': '2024', 'teacherId': str(ObjectId()), 'institution': 'University'}
+
+    with mock.patch.object(CourseService, 'load_teacher_summaries', return_value={}):
+        with pytest.raises(ValueError, match="Teacher not found"):
+            CourseService.create_course(course)
+
+
+def test_import_roster_batches_lookups_and_writes():
+    students = [{'_id': ObjectId()} for _ in range(5)]
+    directory = CountingCollection('studentDirectory', students)
+    enrollments = CountingCollection('enrollments')
+    courses = mock.Mock()
+    courses.find_one.return_value = {'_id': ObjectId()}
+
+    with mock.patch('services.course_service.ROSTER_BATCH_SIZE', 2), \
+            mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.student_collection', directory), \
+            mock.patch('services.course_service.enrollment_collection', enrollments), \
+            mock.patch('services.course_service.VersionStamps'):
+        report = CourseService.import_roster(
+            str(courses.find_one.return_value['_id']),
+            ((line, str(student['_id'])) for line, student in enumerate(students, start=2))
+        )
+
+    # Three batches of at most two rows: one lookup and one bulk write each
+    assert directory.calls == ['find'] * 3
+    assert enrollments.calls == ['bulk_write'] * 3
+    assert [entry['status'] for entry in report] == ['enrolled'] * 5
+    assert [entry['line'] for entry in report] == [2, 3, 4, 5, 6]
+
+
+def test_import_roster_reports_duplicates_missing_students_and_reactivates():
+    course_id, enrolled_id, removed_id = ObjectId(), ObjectId(), ObjectId()
+    directory = CountingCollection('studentDirectory', [
+        {'_id': enrolled_id, 'email': 'Alice@Uni.edu'},
+        {'_id': removed_id, 'email': 'bob@uni.edu'}
+    ])
+    duplicate = BulkWriteError({'writeErrors': [{'index': 0, 'code': 11000, 'errmsg': 'duplicate key'}]})
+    enrollments = CountingCollection('enrollments', errors={'bulk_write': duplicate})
+    courses = mock.Mock()
+    courses.find_one.return_value = {'_id': course_id}
+    rows = [(2, 'alice@uni.edu'), (3, 'BOB@UNI.EDU'), (4, 'nobody@uni.edu'), (5, str(ObjectId()))]
+
+    with mock.patch('services.course_service.course_collection', courses), \
+            mock.patch('services.course_service.student_collection', directory), \
+            mock.patch('services.course_service.enrollment_collection', enrollments), \
+            mock.patch('services.course_service.VersionStamps'):
+        report = CourseService.import_roster(str(course_id), rows)
+
+    assert [entry['status'] for entry in report] == ['duplicate', 'enrolled', 'not_found', 'not_found']
+    # Emails are looked up case-insensitively, as entered
+    (query, _), lookup_options = directory.arguments[0]
+    assert sorted(query['$or'][1]['email']['$in']) == ['BOB@UNI.EDU', 'alice@uni.edu', 'nobody@uni.edu']
+    assert lookup_options['collation'] == {'locale': 'en', 'strength': 2}
+    # Already-active enrollments are left to the unique index; inactive ones are reactivated
+    (operations,), _ = enrollments.arguments[0]
+    assert [operation._filter['studentId'] for operation in operations] == [enrolled_id, removed_id]
+    assert operations[1]._filter['status'] == {'$ne': 'active'}
+    assert operations[1]._doc['$set']['status'] == 'active'
+    assert operations[1]._upsert is True
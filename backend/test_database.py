@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from unittest import mock
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+
+from config import database
+
+
+def test_importing_services_does_not_need_mongo():
+    env = {k: v for k, v in os.environ.items() if k != 'MONGODB_URI'}
+    code = (
+        "import services.course_service, services.auth_service, routes.courses\n"
+        "from config import database\n"
+        "assert database._client is None\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_client_is_rebuilt_after_fork():
+    with mock.patch.object(database, 'MongoClient') as client_class, \
+            mock.patch.object(database, '_client_pid', None), \
+            mock.patch.object(database, '_client', None), \
+            mock.patch.dict(os.environ, {'MONGO_MAX_POOL_SIZE': '8', 'MONGO_WAIT_QUEUE_TIMEOUT_MS': '500'}):
+        with mock.patch('config.database.os.getpid', return_value=100):
+            parent = database.get_client()
+            assert database.get_client() is parent
+        with mock.patch('config.database.os.getpid', return_value=101):
+            database.get_client()
+
+    assert client_class.call_count == 2
+    options = client_class.call_args.kwargs
+    assert options['maxPoolSize'] == 8
+    assert options['waitQueueTimeoutMS'] == 500
+    assert 'minPoolSize' not in options
@@ -0,0 +1,37 @@
+import os
+import runpy
+from types import SimpleNamespace
+from unittest import mock
+
+CONF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+
+
+def load_conf(**env):
+    with mock.patch.dict(os.environ, env):
+        return runpy.run_path(CONF)
+
+
+def test_settings_follow_environment():
+    conf = load_conf(WEB_CONCURRENCY='3', GUNICORN_MAX_REQUESTS='1000', PORT='8000')
+
+    assert conf['workers'] == 3
+    assert conf['bind'] == '0.0.0.0:8000'
+    assert conf['max_requests_jitter'] == 100
+    assert conf['preload_app'] is True
+
+
+def test_worker_recycled_once_rss_passes_limit():
+    conf = load_conf(GUNICORN_MAX_WORKER_RSS_MB='100', GUNICORN_RSS_CHECK_INTERVAL='2')
+    worker = SimpleNamespace(alive=True, pid=1, log=mock.Mock(), requests_handled=0)
+    post_request = conf['post_request']
+
+    with mock.patch.dict(post_request.__globals__, rss_bytes=lambda: 50 * 1024 * 1024):
+        post_request(worker, None, None, None)
+        post_request(worker, None, None, None)
+    assert worker.alive
+
+    with mock.patch.dict(post_request.__globals__, rss_bytes=lambda: 200 * 1024 * 1024):
+        post_request(worker, None, None, None)
+        assert worker.alive
+        post_request(worker, None, None, None)
+    assert not worker.alive
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from bson import ObjectId
+from flask import Flask
+
+from utils.helpers import create_response
+from utils.json_provider import MongoJSONProvider
+
+
+def test_encodes_mongo_documents_in_one_pass():
+    app = Flask(__name__)
+    app.json = MongoJSONProvider(app)
+    course_id, teacher_id = ObjectId(), ObjectId()
+    course = {
+        '_id': course_id,
+        'teacherId': teacher_id,
+        'students': [{'studentId': teacher_id, 'enrollDate': datetime(2024, 1, 2, 3, 4, 5)}],
+        'thumbnail': b'\x00\x01'
+    }
+
+    with app.app_context():
+        response, status = create_response({'course': course})
+
+    assert status == 200
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {'course': {
+        '_id': str(course_id),
+        'teacherId': str(teacher_id),
+        'students': [{'studentId': str(teacher_id), 'enrollDate': 'Tue, 02 Jan 2024 03:04:05 GMT'}],
+        'thumbnail': 'AAE='
+    }}
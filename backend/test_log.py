@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+from unittest import mock
+
+from flask import Flask
+
+from utils.log import JsonFormatter, NonBlockingQueueHandler, RequestDebugSampler
+
+
+def make_record(level=logging.DEBUG, msg='Found %d courses', args=(3,), **extra):
+    record = logging.makeLogRecord({'name': 'test', 'levelno': level, 'levelname': logging.getLevelName(level),
+                                    'msg': msg, 'args': args})
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(make_record(courseId='abc')))
+
+    assert entry['msg'] == 'Found 3 courses'
+    assert entry['level'] == 'DEBUG'
+    assert entry['courseId'] == 'abc'
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().msg == 'Found 3 courses'
+
+
+def test_debug_sampling_is_per_request_and_per_route():
+    app = Flask(__name__)
+    app.add_url_rule('/quiet', 'quiet', lambda: '')
+    app.add_url_rule('/loud', 'loud', lambda: '')
+    sampler = RequestDebugSampler()
+
+    with mock.patch.dict('utils.log.LOG_DEBUG_SAMPLE_RATES', {'quiet': 0.0}):
+        with app.test_request_context('/quiet'):
+            app.preprocess_request()
+            assert not sampler.filter(make_record())
+            assert sampler.filter(make_record(level=logging.ERROR))
+        with app.test_request_context('/loud'):
+            assert sampler.filter(make_record())
+
+    assert sampler.filter(make_record())
+
+
+def test_importing_modules_leaves_logging_unconfigured():
+    code = (
+        "import logging, threading\n"
+        "import services.course_service, routes.courses, app\n"
+        "import utils.log\n"
+        "assert utils.log._handler is None\n"
+        "assert logging.getLogger().handlers == []\n"
+        "assert threading.active_count() == 1, threading.enumerate()\n"
+        "app.create_app()\n"
+        "assert utils.log._handler is not None\n"
+    )
+    env = {**os.environ, 'MONGODB_URI': 'mongodb://localhost:27017', 'SESSION_SECRET_KEY': 'test',
+           'DB_INIT_ON_STARTUP': '0', 'APP_WARMUP': '0'}
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
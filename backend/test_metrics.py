@@ -0,0 +1,109 @@
+import os
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from flask import Flask
+from prometheus_client import REGISTRY
+from pymongo.collection import Collection
+
+os.environ.setdefault('SESSION_SECRET_KEY', 'test-session-secret')
+
+from app import AsyncIOFlask
+
+from utils.metrics import MongoCommandMetrics, MongoPoolMetrics, init_metrics, instrument_s3_client
+
+
+def sample(text, name, route):
+    prefix = f'{name}{{route="{route}"}} '
+    return next(float(line[len(prefix):]) for line in text.splitlines() if line.startswith(prefix))
+
+
+class EmptyBody:
+    def stream(self, **kwargs):
+        return iter([b''])
+
+
+def fake_send(request, **kwargs):
+    # Answer at the HTTP layer so the client's call events still fire
+    return AWSResponse(request.url, 200, {}, EmptyBody())
+
+
+def test_counts_mongo_and_s3_calls_per_request():
+    s3 = boto3.client('s3', region_name='us-east-1', aws_access_key_id='x', aws_secret_access_key='y')
+    instrument_s3_client(s3)
+    s3.meta.events.register('before-send.s3', fake_send)
+    listener = MongoCommandMetrics()
+
+    app = Flask(__name__)
+    init_metrics(app)
+
+    @app.route('/things/<thing_id>')
+    def get_thing(thing_id):
+        for _ in range(3):
+            listener.succeeded(SimpleNamespace(command_name='find', duration_micros=1500))
+        s3.head_bucket(Bucket='bucket1')
+        s3.head_bucket(Bucket='bucket1')
+        return {'id': thing_id}
+
+    client = app.test_client()
+    assert client.get('/things/1').status_code == 200
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    route = '/things/<thing_id>'
+    assert sample(metrics, 'mongo_commands_per_request_sum', route) == 3
+    assert sample(metrics, 's3_calls_per_request_sum', route) == 2
+    assert sample(metrics, 'mongo_commands_per_request_count', route) == 1
+    assert 'http_request_duration_seconds_count{method="GET",route="/things/<thing_id>",status="200"} 1.0' in metrics
+
+
+def test_records_pool_wait_per_checkout():
+    listener = MongoPoolMetrics()
+    before = REGISTRY.get_sample_value('mongo_pool_wait_seconds_count') or 0
+
+    listener.connection_check_out_started(SimpleNamespace())
+    listener.connection_checked_out(SimpleNamespace())
+    listener.connection_check_out_started(SimpleNamespace())
+    listener.connection_check_out_failed(SimpleNamespace(reason='timeout'))
+    # A checkout without a recorded start is ignored
+    listener.connection_checked_out(SimpleNamespace())
+
+    assert REGISTRY.get_sample_value('mongo_pool_wait_seconds_count') == before + 2
+    assert REGISTRY.get_sample_value('mongo_pool_checkout_failures_total', {'reason': 'timeout'}) >= 1
+
+
+def test_counts_mongo_calls_made_on_motor_executor_threads():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    listener = MongoCommandMetrics()
+    threads = []
+
+    def fake_find(self, *args, **kwargs):
+        # pymongo fires command events on the thread running the operation,
+        # which for Motor is an executor thread rather than the request thread
+        threads.append(threading.current_thread())
+        listener.succeeded(SimpleNamespace(command_name='find', duration_micros=1500))
+        return mock.Mock(limit=lambda n: iter([]))
+
+    app = AsyncIOFlask(__name__)
+    init_metrics(app)
+
+    @app.route('/async/<thing_id>')
+    async def get_thing(thing_id):
+        client = AsyncIOMotorClient('mongodb://localhost:1', connect=False)
+        try:
+            for _ in range(2):
+                await client.db.things.find_one({'_id': thing_id})
+        finally:
+            client.close()
+        return {'id': thing_id}
+
+    client = app.test_client()
+    with mock.patch.object(Collection, 'find', fake_find):
+        assert client.get('/async/1').status_code == 200
+
+    assert threads and threading.current_thread() not in threads
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert sample(metrics, 'mongo_commands_per_request_sum', '/async/<thing_id>') == 2
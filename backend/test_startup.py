@@ -0,0 +1,15 @@
+from benchmarks.startup import HEAVY_MODULES, probe
+
+
+def test_create_app_defers_heavy_sdks():
+    report = probe()
+
+    assert report['heavyModules'] == []
+    assert 'boto3' not in report['imports']
+    assert set(HEAVY_MODULES).isdisjoint(report['imports'])
+
+
+def test_async_mode_defers_motor():
+    report = probe({'ASYNC_IO_MODE': '1'})
+
+    assert report['heavyModules'] == []
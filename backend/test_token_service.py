@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+os.environ.setdefault('SESSION_SECRET_KEY', 'test-session-secret')
+
+from services.token_service import TokenService
+
+
+def test_issued_token_verifies_with_claims():
+    session = TokenService.issue('507f1f77bcf86cd799439011', 'teacher')
+    claims = TokenService.verify(session['token'])
+
+    assert claims['sub'] == '507f1f77bcf86cd799439011'
+    assert claims['role'] == 'teacher'
+    assert claims['exp'] == session['expiresAt']
+
+
+def test_tampered_token_is_rejected():
+    token = TokenService.issue('507f1f77bcf86cd799439011', 'student')['token']
+    payload, signature = token.split('.')
+    forged = TokenService.issue('507f1f77bcf86cd799439011', 'teacher')['token'].split('.')[0]
+
+    assert TokenService.verify(f"{forged}.{signature}") is None
+    assert TokenService.verify('not-a-token') is None
+
+
+def test_expired_token_is_rejected():
+    token = TokenService.issue('507f1f77bcf86cd799439011', 'teacher', ttl=-1)['token']
+    assert TokenService.verify(token) is None
+
+
+def test_missing_secret_key_fails_app_startup_outside_debug():
+    env = {key: value for key, value in os.environ.items() if key not in ('SESSION_SECRET_KEY', 'FLASK_DEBUG')}
+    env.update(MONGODB_URI='mongodb://localhost:27017', DB_INIT_ON_STARTUP='0', APP_WARMUP='0')
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def run(code, **extra):
+        return subprocess.run([sys.executable, '-c', code], cwd=backend_dir, env={**env, **extra},
+                              capture_output=True, text=True)
+
+    imported = run('import app')
+    failed = run('import app; app.create_app()')
+    debug = run('import app; app.create_app()', FLASK_DEBUG='1')
+
+    assert imported.returncode == 0, imported.stderr
+    assert failed.returncode != 0
+    assert 'SESSION_SECRET_KEY is not set' in failed.stderr
+    assert debug.returncode == 0, debug.stderr
@@ -0,0 +1,68 @@
+"""Process-wide asyncio event loop for async views.
+
+Flask runs `async def` views by default with asgiref, which starts a fresh
+event loop per call. Async drivers such as Motor bind their connection pool to
+one loop, so in async I/O mode every coroutine is instead run on a single
+long-lived loop in a background thread.
+
+This does not make the server asynchronous. The app is still WSGI, and each
+request thread blocks on its coroutine's result, so a process serves no more
+requests at once than it has server threads (gunicorn workers x
+GUNICORN_THREADS), the same bound as sync mode. The loop only overlaps I/O
+that a single view awaits concurrently.
+"""
+
+from concurrent.futures import Future
+from functools import wraps
+import asyncio
+import contextvars
+import os
+import threading
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting it on first use (and after fork)."""
+    global _loop, _loop_pid
+    if _loop_pid != os.getpid():
+        with _loop_lock:
+            if _loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='async-io', daemon=True)
+                thread.start()
+                _loop, _loop_pid = loop, os.getpid()
+    return _loop
+
+def run(coro):
+    """Run a coroutine on the background loop and wait for its result.
+
+    The caller's context variables (including Flask's request and app
+    contexts) are copied into the task, so views can use `request` and `g`.
+    """
+    loop = get_loop()
+    context = contextvars.copy_context()
+    result = Future()
+
+    def start():
+        task = loop.create_task(coro, context=context)
+
+        def done(task):
+            if task.cancelled():
+                result.cancel()
+            elif task.exception() is not None:
+                result.set_exception(task.exception())
+            else:
+                result.set_result(task.result())
+        task.add_done_callback(done)
+
+    loop.call_soon_threadsafe(start)
+    return result.result()
+
+def async_to_sync(func):
+    """Wrap a coroutine function so it runs on the background loop."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return run(func(*args, **kwargs))
+    return wrapper
@@ -1,11 +1,14 @@
-from typing import Dict, Any, Tuple, Optional
-from flask import jsonify
-from bson import ObjectId
+from typing import Dict, Any, List, Tuple, Optional
+from flask import jsonify, request
+from bson import json_util
+import base64
+import hashlib
 
 def create_response(
     data: Optional[Dict[str, Any]] = None, 
     error: Optional[str] = None, 
-    status_code: int = 200
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
 ) -> Tuple[Dict[str, Any], int]:
     """Create a standardized JSON response.
     
@@ -13,6 +16,7 @@ def create_response(
         data (Optional[Dict[str, Any]]): The data to return in the response
         error (Optional[str]): Error message if any
         status_code (int): HTTP status code
+        headers (Optional[Dict[str, str]]): Extra response headers
         
     Returns:
         tuple: (response_data, status_code)
@@ -31,8 +35,29 @@ def create_response(
     response.headers.add('Access-Control-Allow-Origin', 'http://localhost:5173')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
     return response, status_code
 
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that determine a response.
+
+    Example:
+        >>> make_etag("/api/courses/teacher/1?limit=20", [3, 7])
+        '"ef294ac9f728740d0c2f162e0fa14040"'
+    """
+    return '"' + hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest() + '"'
+
+def conditional_headers(etag: str) -> Dict[str, str]:
+    """Headers that make browsers revalidate a response with If-None-Match."""
+    return {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+def not_modified(etag: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """Return a 304 response if the request's If-None-Match matches etag, else None."""
+    if not request.if_none_match.contains(etag.strip('"')):
+        return None
+    return create_response(status_code=304, headers=conditional_headers(etag))
+
 def serialize_object_id(obj: Dict[str, Any]) -> Dict[str, Any]:
     """Convert MongoDB ObjectId to string in a dictionary.
     
@@ -52,17 +77,56 @@ def serialize_object_id(obj: Dict[str, Any]) -> Dict[str, Any]:
         obj['_id'] = str(obj['_id'])
     return obj 
 
-def serialize_mongo_doc(doc):
-    """Convert MongoDB document to JSON-serializable format."""
-    if doc is None:
-        return None
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset pagination values as an opaque URL-safe token.
+    
+    Args:
+        values (List[Any]): Sort key values of the last returned item
         
-    if isinstance(doc, dict):
-        return {
-            key: str(value) if isinstance(value, ObjectId) else serialize_mongo_doc(value)
-            for key, value in doc.items()
-        }
-    elif isinstance(doc, list):
-        return [serialize_mongo_doc(item) for item in doc]
-    else:
-        return doc 
\ No newline at end of file
+    Returns:
+        str: Opaque cursor to hand back to the client
+        
+    Example:
+        >>> cursor = encode_cursor([ObjectId("507f1f77bcf86cd799439011")])
+    """
+    raw = json_util.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+def parse_page_args(args, default_limit: int, max_limit: int) -> Tuple[int, Optional[List[Any]]]:
+    """Read the 'limit' and 'cursor' query parameters of a paginated request.
+    
+    Args:
+        args: The request's query arguments (request.args)
+        default_limit (int): Page size when no limit is given
+        max_limit (int): Largest page size a client may ask for
+        
+    Returns:
+        tuple: (limit, cursor_values) where cursor_values is None on the first page
+        
+    Raises:
+        ValueError: If limit is not a positive integer or the cursor is malformed
+    """
+    try:
+        limit = int(args.get('limit', default_limit))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+
+    cursor = args.get('cursor')
+    return min(limit, max_limit), decode_cursor(cursor) if cursor else None
@@ -0,0 +1,59 @@
+"""orjson-backed JSON provider for Flask.
+
+Installed on the app in create_app, so `jsonify`, `create_response` and views
+returning dicts all encode through it. Mongo documents can be returned as
+they come from the driver: ObjectId, datetime and bytes are encoded in the
+same pass as the rest of the document, with no per-document pre-walk.
+
+    ObjectId  -> "507f1f77bcf86cd799439011"
+    datetime  -> "Mon, 01 Jan 2024 12:00:00 GMT" (RFC 822, as Flask's default
+                 provider encodes it; naive values are taken as UTC, which is
+                 how pymongo returns them)
+    bytes     -> base64 string
+"""
+
+from decimal import Decimal
+from typing import Any, Union
+import base64
+from datetime import date
+import orjson
+from bson import ObjectId
+from flask import Response
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+# Dates go through _default so they keep the format clients already parse
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson has no native support for."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode('ascii')
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class MongoJSONProvider(JSONProvider):
+    """Flask JSON provider that encodes Mongo documents with orjson.
+
+    Example:
+        >>> app.json = MongoJSONProvider(app)
+        >>> app.json.dumps({"_id": ObjectId("507f1f77bcf86cd799439011")})
+        '{"_id":"507f1f77bcf86cd799439011"}'
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=_OPTIONS)
+        return self._app.response_class(body, mimetype='application/json')
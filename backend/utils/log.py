@@ -0,0 +1,181 @@
+"""Structured, non-blocking logging.
+
+Request threads only put log records on an in-memory queue; a background
+listener thread formats them as one JSON object per line and writes them to
+stdout. Records below LOG_LEVEL are dropped by the logger before any message
+formatting happens, so pass values as arguments rather than f-strings:
+
+    logger.debug("Found %d courses for teacher %s", len(courses), teacher_id)
+
+Debug records logged inside a request are sampled per route: each request is
+kept or dropped as a whole, at the rate configured for its endpoint.
+
+Environment Variables:
+    LOG_LEVEL (str): Minimum level for the app's own loggers, defaults to INFO
+    LOG_LIBRARY_LEVEL (str): Minimum level for third-party loggers (pymongo,
+        botocore, ...), defaults to WARNING
+    LOG_QUEUE_SIZE (int): Records buffered before new ones are dropped
+    LOG_DEBUG_SAMPLE_RATE (float): Share of requests whose debug logs are kept,
+        defaults to 1.0
+    LOG_DEBUG_SAMPLE_RATES (str): Per-endpoint overrides, e.g.
+        "courses.get_teacher_courses=0.01,courses.get_course_files=0.1"
+"""
+
+from datetime import datetime, timezone
+from typing import Dict
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from flask import g, has_request_context, request
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_LIBRARY_LEVEL = os.getenv('LOG_LIBRARY_LEVEL', 'WARNING').upper()
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        endpoint, _, rate = entry.partition('=')
+        rates[endpoint.strip()] = float(rate)
+    return rates
+
+LOG_DEBUG_SAMPLE_RATES = _parse_sample_rates(os.getenv('LOG_DEBUG_SAMPLE_RATES', ''))
+
+# Top-level packages whose loggers follow LOG_LEVEL rather than LOG_LIBRARY_LEVEL
+APP_LOGGERS = ('config', 'decorators', 'routes', 'services', 'utils', 'app', '__main__')
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a single-line JSON object.
+
+    Fields passed with `extra=` are included alongside the standard ones.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RequestDebugSampler(logging.Filter):
+    """Keep the debug records of a sampled share of requests.
+
+    Records at INFO and above always pass. Outside a request every record
+    passes. Kept records are tagged with the request's endpoint and path.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not has_request_context():
+            return True
+
+        record.endpoint = request.endpoint
+        record.path = request.path
+        if record.levelno > logging.DEBUG:
+            return True
+
+        if '_log_debug_sampled' not in g:
+            rate = LOG_DEBUG_SAMPLE_RATES.get(request.endpoint, LOG_DEBUG_SAMPLE_RATE)
+            g._log_debug_sampled = random.random() < rate
+        return g._log_debug_sampled
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller.
+
+    Records are dropped (and counted) when the queue is full instead of
+    waiting for the listener, and JSON formatting is left to the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the args now so the record no longer references caller
+        # objects, but leave JSON encoding to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_handler = None
+_listener = None
+_lock = threading.Lock()
+
+def _start_listener() -> None:
+    global _listener
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(_handler.queue, output)
+    _listener.start()
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+def configure_logging() -> None:
+    """Route the root logger through the queue handler (once per process)."""
+    global _handler
+    if _handler is not None:
+        return
+    with _lock:
+        if _handler is not None:
+            return
+        handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        handler.addFilter(RequestDebugSampler())
+        _handler = handler
+        _start_listener()
+
+        root = logging.getLogger()
+        root.handlers = [handler]
+        root.setLevel(LOG_LIBRARY_LEVEL)
+        for name in APP_LOGGERS:
+            logging.getLogger(name).setLevel(LOG_LEVEL)
+        atexit.register(_stop_listener)
+        # The listener thread does not survive a fork; give children their own
+        os.register_at_fork(after_in_child=_start_listener)
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a logger for a module.
+
+    Has no side effects, so it is safe at import time; entry points (create_app,
+    manage.py, the benchmarks) call configure_logging themselves.
+
+    Example:
+        >>> logger = get_logger(__name__)
+        >>> logger.info("Course created", extra={"courseId": course_id})
+    """
+    return logging.getLogger(name)
+
+def dropped_records() -> int:
+    """Number of records dropped because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
@@ -0,0 +1,239 @@
+"""Per-request performance metrics exposed in Prometheus format.
+
+`init_metrics(app)` times every request and, through pymongo command
+monitoring and botocore event hooks, counts the Mongo commands and S3 API
+calls each request makes. Per-request call counts are recorded against the
+route, so an N+1 regression shows up as a route whose commands-per-request
+grows with the data.
+
+Clients opt in with `MongoClient(..., event_listeners=[MongoCommandMetrics(),
+MongoPoolMetrics()])` and `instrument_s3_client(client)`.
+
+The current request's stats live in a context variable, and driver events
+fire on whichever thread ran the call. In async I/O mode, utils.aio copies
+the request's context into the view's task and Motor copies the task's
+context into its executor threads, so Motor calls are counted. Any other
+work handed to an executor is only counted if it runs in a copy of the
+context (`contextvars.copy_context().run`).
+
+Environment Variables:
+    PROMETHEUS_MULTIPROC_DIR (str): Set when running several worker processes
+        so /metrics aggregates all of them (see prometheus_client docs)
+"""
+
+from typing import Optional
+import contextvars
+import os
+import threading
+import time
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess, REGISTRY
+)
+from pymongo import monitoring
+
+# Buckets for "calls made by one request"
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float('inf'))
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    ['method', 'route', 'status']
+)
+MONGO_COMMANDS_PER_REQUEST = Histogram(
+    'mongo_commands_per_request', 'Mongo commands issued by one request',
+    ['route'], buckets=CALL_COUNT_BUCKETS
+)
+MONGO_TIME_PER_REQUEST = Histogram(
+    'mongo_time_per_request_seconds', 'Time one request spent waiting on Mongo', ['route']
+)
+S3_CALLS_PER_REQUEST = Histogram(
+    's3_calls_per_request', 'S3 API calls issued by one request',
+    ['route'], buckets=CALL_COUNT_BUCKETS
+)
+S3_TIME_PER_REQUEST = Histogram(
+    's3_time_per_request_seconds', 'Time one request spent waiting on S3', ['route']
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    'mongo_command_duration_seconds', 'Mongo command latency', ['command']
+)
+MONGO_COMMAND_FAILURES = Counter(
+    'mongo_command_failures_total', 'Failed Mongo commands', ['command']
+)
+S3_CALL_LATENCY = Histogram(
+    's3_call_duration_seconds', 'S3 API call latency', ['operation']
+)
+MONGO_POOL_WAIT = Histogram(
+    'mongo_pool_wait_seconds', 'Time spent waiting to check a connection out of the pool',
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, float('inf'))
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    'mongo_pool_checkout_failures_total', 'Failed connection checkouts', ['reason']
+)
+MONGO_WARMUP = Histogram(
+    'mongo_warmup_seconds', 'Time a worker took to open its Mongo connections'
+)
+APP_COLD_START = Histogram(
+    'app_cold_start_seconds', 'Time from create_app() to ready to serve',
+    buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30, float('inf'))
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Cache lookups by cache and result (hit/miss)', ['cache', 'result']
+)
+
+class RequestStats:
+    """Mongo and S3 call accounting for the current request."""
+
+    __slots__ = ('mongo_commands', 'mongo_seconds', 's3_calls', 's3_seconds')
+
+    def __init__(self):
+        self.mongo_commands = 0
+        self.mongo_seconds = 0.0
+        self.s3_calls = 0
+        self.s3_seconds = 0.0
+
+# Stats of the request being handled; a context variable rather than `g` so
+# it can be read from driver callbacks without touching Flask's globals
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    'request_stats', default=None
+)
+
+def current_stats() -> Optional[RequestStats]:
+    """Return the stats of the request being handled, if any."""
+    return _request_stats.get()
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo listener recording command latency, per command and per request."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_COMMAND_FAILURES.labels(event.command_name).inc()
+        self._record(event)
+
+    @staticmethod
+    def _record(event) -> None:
+        seconds = event.duration_micros / 1e6
+        MONGO_COMMAND_LATENCY.labels(event.command_name).observe(seconds)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.mongo_commands += 1
+            stats.mongo_seconds += seconds
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """pymongo listener recording how long requests wait for a pooled connection.
+
+    Checkout events fire on the thread doing the checkout, so the start time
+    is kept in a thread-local between "started" and "checked out"/"failed".
+    """
+
+    def __init__(self):
+        self._checkout = threading.local()
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        self._checkout.started = time.perf_counter()
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        self._observe()
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+        self._observe()
+
+    def _observe(self) -> None:
+        started = getattr(self._checkout, 'started', None)
+        if started is not None:
+            MONGO_POOL_WAIT.observe(time.perf_counter() - started)
+            self._checkout.started = None
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+def _s3_before_call(model, context, **kwargs) -> None:
+    context['metrics_started'] = time.perf_counter()
+
+def _s3_after_call(model, context, **kwargs) -> None:
+    started = context.pop('metrics_started', None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    S3_CALL_LATENCY.labels(model.name).observe(seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.s3_calls += 1
+        stats.s3_seconds += seconds
+
+def instrument_s3_client(client) -> None:
+    """Record latency and per-request counts for every API call of a boto3 client.
+
+    Presigning is local and makes no API call, so it is not counted.
+    """
+    client.meta.events.register('before-call.s3', _s3_before_call)
+    client.meta.events.register('after-call.s3', _s3_after_call)
+
+def _route_label() -> str:
+    # The URL rule, not the path, so IDs don't explode label cardinality
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+def _start_request() -> None:
+    g._metrics_started = time.perf_counter()
+    g._metrics_token = _request_stats.set(RequestStats())
+
+def _finish_request(response: Response) -> Response:
+    started = g.pop('_metrics_started', None)
+    token = g.pop('_metrics_token', None)
+    if started is None:
+        return response
+
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    if request.endpoint == 'metrics':
+        return response
+
+    route = _route_label()
+    REQUEST_LATENCY.labels(request.method, route, response.status_code).observe(
+        time.perf_counter() - started
+    )
+    MONGO_COMMANDS_PER_REQUEST.labels(route).observe(stats.mongo_commands)
+    MONGO_TIME_PER_REQUEST.labels(route).observe(stats.mongo_seconds)
+    S3_CALLS_PER_REQUEST.labels(route).observe(stats.s3_calls)
+    S3_TIME_PER_REQUEST.labels(route).observe(stats.s3_seconds)
+    return response
+
+def _render_metrics() -> Response:
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+def init_metrics(app: Flask) -> None:
+    """Time every request of an app and serve the metrics on /metrics."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule('/metrics', 'metrics', _render_metrics)
@@ -14,6 +14,8 @@ function CourseFiles({ courseId, refreshTrigger }) {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
   const [deleting, setDeleting] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     const fetchFiles = async () => {
@@ -21,6 +23,7 @@ function CourseFiles({ courseId, refreshTrigger }) {
         const response = await courseService.listMaterials(courseId)
         if (response && response.files) {
           setFiles(response.files)
+          setNextCursor(response.nextCursor || null)
         }
       } catch (error) {
         console.error('Error fetching files:', error)
@@ -33,6 +36,26 @@ function CourseFiles({ courseId, refreshTrigger }) {
     fetchFiles()
   }, [courseId, refreshTrigger])
 
+  /**
+   * Loads the next page of files
+   * @async
+   * @function
+   * @returns {Promise<void>}
+   */
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true)
+      const response = await courseService.listMaterials(courseId, nextCursor)
+      setFiles([...files, ...response.files])
+      setNextCursor(response.nextCursor || null)
+    } catch (error) {
+      console.error('Error fetching files:', error)
+      alert('Failed to load more files')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   /**
    * Handles file deletion
    * @async
@@ -99,6 +122,15 @@ function CourseFiles({ courseId, refreshTrigger }) {
               </div>
             </div>
           ))}
+          {nextCursor && (
+            <button
+              onClick={handleLoadMore}
+              className="load-more-button"
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -12,12 +12,15 @@ function StudentManagement({ courseId }) {
     const [students, setStudents] = useState([])
     const [loading, setLoading] = useState(true)
     const [error, setError] = useState('')
+    const [nextCursor, setNextCursor] = useState(null)
+    const [loadingMore, setLoadingMore] = useState(false)
 
     useEffect(() => {
         const fetchStudents = async () => {
             try {
                 const response = await courseService.getCourseStudents(courseId)
                 setStudents(response.students)
+                setNextCursor(response.nextCursor || null)
             } catch (error) {
                 setError('Failed to load students')
             } finally {
@@ -28,6 +31,25 @@ function StudentManagement({ courseId }) {
         fetchStudents()
     }, [courseId])
 
+    /**
+     * Fetches the next page of the roster
+     * @async
+     * @function
+     * @returns {Promise<void>}
+     */
+    const handleLoadMore = async () => {
+        try {
+            setLoadingMore(true)
+            const response = await courseService.getCourseStudents(courseId, nextCursor)
+            setStudents([...students, ...response.students])
+            setNextCursor(response.nextCursor || null)
+        } catch (error) {
+            setError('Failed to load students')
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     /**
      * Handles student removal from the course
      * @async
@@ -68,6 +90,15 @@ function StudentManagement({ courseId }) {
                         ))}
                     </ul>
                 )}
+                {nextCursor && (
+                    <button
+                        onClick={handleLoadMore}
+                        className="load-more-button"
+                        disabled={loadingMore}
+                    >
+                        {loadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                )}
             </div>
         </div>
     )
@@ -17,6 +17,8 @@ function TeacherDashboard() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
   const [showCreateForm, setShowCreateForm] = useState(false)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const navigate = useNavigate()
 
   /**
@@ -34,9 +36,11 @@ function TeacherDashboard() {
       if (response && response.courses) {
         console.log('Received courses:', response.courses)
         setCourses(response.courses)
+        setNextCursor(response.nextCursor || null)
       } else {
         console.log('No courses found:', response)
         setCourses([])
+        setNextCursor(null)
       }
       
     } catch (error) {
@@ -47,6 +51,26 @@ function TeacherDashboard() {
     }
   }
 
+  /**
+   * Fetches the next page of courses
+   * @async
+   * @function
+   * @returns {Promise<void>}
+   */
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true)
+      const response = await courseService.getTeacherCourses(userData._id || userData.userId, nextCursor)
+      setCourses([...courses, ...response.courses])
+      setNextCursor(response.nextCursor || null)
+    } catch (error) {
+      console.error('Error details:', error.response || error)
+      alert('Failed to load more courses')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => {
     const user = JSON.parse(localStorage.getItem('user'))
     console.log('Full user data:', user)
@@ -140,6 +164,15 @@ function TeacherDashboard() {
               ))}
             </div>
           )}
+          {!loading && nextCursor && (
+            <button
+              onClick={handleLoadMore}
+              className="load-more-button"
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       </div>
 
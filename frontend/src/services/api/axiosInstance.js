@@ -13,8 +13,8 @@ const axiosInstance = axios.create({
 axiosInstance.interceptors.request.use(
     (config) => {
         const user = JSON.parse(localStorage.getItem('user'))
-        if (user) {
-            config.headers.Authorization = JSON.stringify(user)
+        if (user?.token) {
+            config.headers.Authorization = `Bearer ${user.token}`
         }
         return config
     },
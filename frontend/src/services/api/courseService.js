@@ -1,18 +1,31 @@
+import axios from 'axios'
 import axiosInstance from './axiosInstance'
 
 export const courseService = {
     // Course materials
+    // Uploads go straight to S3 with a presigned POST; the API only issues
+    // the upload and registers the file once it has landed
     uploadMaterial: async (courseId, formData) => {
-        const response = await axiosInstance.post(`/api/courses/${courseId}/upload`, formData, {
-            headers: {
-                'Content-Type': 'multipart/form-data'
-            }
+        const title = formData.get('title')
+        const { data: upload } = await axiosInstance.post(`/api/courses/${courseId}/uploads`, { title })
+
+        const s3Form = new FormData()
+        Object.entries(upload.fields).forEach(([name, value]) => s3Form.append(name, value))
+        s3Form.append('file', formData.get('file'))
+        await axios.post(upload.url, s3Form)
+
+        const response = await axiosInstance.post(`/api/courses/${courseId}/uploads/complete`, {
+            fileKey: upload.fileKey,
+            title,
+            description: formData.get('description') || ''
         })
         return response.data
     },
 
-    listMaterials: async (courseId) => {
-        const response = await axiosInstance.get(`/api/courses/${courseId}/files`)
+    listMaterials: async (courseId, cursor = null) => {
+        const response = await axiosInstance.get(`/api/courses/${courseId}/files`, {
+            params: cursor ? { cursor } : {}
+        })
         return response.data
     },
 
@@ -40,8 +53,10 @@ export const courseService = {
         return response.data
     },
 
-    getTeacherCourses: async (teacherId) => {
-        const response = await axiosInstance.get(`/api/courses/teacher/${teacherId}`)
+    getTeacherCourses: async (teacherId, cursor = null) => {
+        const response = await axiosInstance.get(`/api/courses/teacher/${teacherId}`, {
+            params: cursor ? { cursor } : {}
+        })
         return response.data
     },
 
@@ -68,8 +83,10 @@ export const courseService = {
     },
 
     // Get enrolled students
-    getCourseStudents: async (courseId) => {
-        const response = await axiosInstance.get(`/api/courses/${courseId}/students`)
+    getCourseStudents: async (courseId, cursor = null) => {
+        const response = await axiosInstance.get(`/api/courses/${courseId}/students`, {
+            params: cursor ? { cursor } : {}
+        })
         return response.data
     },
 